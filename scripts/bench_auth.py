@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request cost of authenticating a bearer token.
+
+Verifies tokens the way get_current_user does (api/v1/routes/auth.py
+verify_token) for a working set of ``--users`` signed-in users, with the
+verified token cache on and off, and reports the auth overhead per request
+and the request rate one core could authenticate. With the principal cache
+warm, this is the whole per-request auth cost. Runs in memory, no database
+needed.
+
+Usage: python scripts/bench_auth.py --users 1000 --requests 200000
+"""
+
+import sys
+import argparse
+import random
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+current_dir = Path(__file__).parent
+src_dir = current_dir.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from api.v1.routes.auth import create_access_token, verify_token
+from services.token_cache import verified_tokens
+
+
+def run(tokens: list[str], requests: list[int]) -> float:
+    """Seconds per request"""
+    started = time.perf_counter()
+    for index in requests:
+        verify_token(tokens[index])
+    return (time.perf_counter() - started) / len(requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bearer token authentication")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200000)
+    args = parser.parse_args()
+
+    tokens = [create_access_token(data={"sub": str(user_id)}) for user_id in range(1, args.users + 1)]
+    rng = random.Random(1)
+    requests = [rng.randrange(args.users) for _ in range(args.requests)]
+
+    print(f"{args.requests} requests from {args.users} users")
+    for name, enabled in (("no cache", False), ("cache", True)):
+        verified_tokens.enabled = enabled
+        # Warm up, so the cached run measures the steady state
+        run(tokens, requests[:args.users * 2])
+        per_request = run(tokens, requests)
+        print(f"{name:>9}: {per_request * 1e6:6.2f} us/request, {1 / per_request:10,.0f} requests/s per core")
+
+
+if __name__ == "__main__":
+    main()
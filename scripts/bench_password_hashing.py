@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop latency for unrelated requests during a signin storm.
+
+Runs ``--logins`` concurrent password verifications, as the signin handler
+does, while a probe task measures how late the loop wakes it up (the delay
+any other endpoint on the worker would see). Compares verifying inline on
+the event loop with services/passwords.py (bcrypt in a thread pool).
+Runs in memory, no database needed.
+
+Usage: python scripts/bench_password_hashing.py --logins 40 --rounds 12 --workers 4
+"""
+
+import sys
+import asyncio
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+current_dir = Path(__file__).parent
+src_dir = current_dir.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from passlib.context import CryptContext
+from services.passwords import PasswordHasher
+
+
+PROBE_INTERVAL = 0.005
+
+
+async def probe(lags: list[float], done: asyncio.Event):
+    """Sleep for PROBE_INTERVAL in a loop and record how late each wakeup is"""
+    while not done.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def storm(verify, logins: int, password: str, password_hash: str) -> tuple[float, list[float]]:
+    lags: list[float] = []
+    done = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, done))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[verify(password, password_hash) for _ in range(logins)])
+    elapsed = time.perf_counter() - started
+
+    done.set()
+    await probe_task
+    return elapsed, lags
+
+
+def report(name: str, logins: int, elapsed: float, lags: list[float]):
+    lags = sorted(lags)
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(
+        f"{name:>8}: {logins / elapsed:7.1f} logins/s | loop lag p50 {statistics.median(lags) * 1000:7.1f} ms, "
+        f"p99 {p99 * 1000:7.1f} ms, max {lags[-1] * 1000:7.1f} ms ({len(lags)} probes)"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Event-loop latency during a signin storm")
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=args.rounds)
+    password = "correct horse battery staple"
+    password_hash = context.hash(password)
+
+    async def inline(password: str, password_hash: str):
+        # The previous signin path, User.verify_password on the event loop
+        await asyncio.sleep(0)
+        return context.verify_and_update(password, password_hash)
+
+    hasher = PasswordHasher(context, workers=args.workers, max_queue=args.logins, queue_timeout=3600)
+
+    print(f"{args.logins} concurrent signins, bcrypt rounds {args.rounds}, {args.workers} hashing threads")
+    report("inline", args.logins, *await storm(inline, args.logins, password, password_hash))
+    report("pool", args.logins, *await storm(hasher.verify, args.logins, password, password_hash))
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark article search: ILIKE scans versus the full-text search backend.
+
+Seeds a corpus of generated articles (slug prefix "bench-"), then times the
+old four-column icontains query against the ranked tsvector search for a few
+query terms. The seeded rows are removed afterwards unless --keep is given.
+
+Usage: python scripts/bench_search.py --articles 50000 --runs 20
+"""
+
+import sys
+import asyncio
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+current_dir = Path(__file__).parent
+src_dir = current_dir.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from tortoise import Tortoise, connections
+from tortoise.queryset import Q
+from db.models import Article, Category
+from db.schema import apply_schema_extras
+from services.search import search_backend
+from config import settings
+
+
+WORDS = (
+    "election market climate energy vaccine research football league startup "
+    "inflation policy court satellite ocean festival album museum budget trade "
+    "hospital virus storm wildfire summit treaty protest galaxy robot battery "
+    "transport housing education coffee recipe travel island mountain river"
+).split()
+
+QUERIES = ["climate", "vaccine research", "robot battery", "zebra"]
+
+SEED_SQL = """
+INSERT INTO articles (
+    title, slug, content, summary, author, status,
+    views_count, likes_count, dislikes_count, shares_count,
+    is_featured, is_trending, is_breaking_news,
+    published_at, created_at, updated_at, category_id
+)
+SELECT
+    initcap(array_to_string(ARRAY(SELECT w[1 + floor(random() * array_length(w, 1))::int] FROM generate_series(1, 6 + g % 2)), ' ')),
+    'bench-' || g,
+    array_to_string(ARRAY(SELECT w[1 + floor(random() * array_length(w, 1))::int] FROM generate_series(1, $2 + g % 2)), ' '),
+    array_to_string(ARRAY(SELECT w[1 + floor(random() * array_length(w, 1))::int] FROM generate_series(1, 25 + g % 2)), ' '),
+    'Author ' || (g % 50),
+    'published',
+    0, 0, 0, 0,
+    false, false, false,
+    now(), now() - (g || ' minutes')::interval, now(), $3
+FROM generate_series(1, $1) AS g, (SELECT $4::varchar[] AS w) AS vocabulary
+"""
+
+
+async def timed(coro_factory, runs: int) -> tuple[float, float]:
+    """Median and p95 latency in milliseconds"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+async def ilike_search(q: str):
+    """The search query used before the full-text backend"""
+    query = Article.filter(status="published").filter(
+        Q(title__icontains=q) |
+        Q(content__icontains=q) |
+        Q(summary__icontains=q) |
+        Q(author__icontains=q)
+    )
+    await query.count()
+    await query.limit(10).prefetch_related("category")
+
+
+async def fulltext_search(q: str):
+    await search_backend.count(q, None)
+    hits = await search_backend.search(q, None, 10)
+    await Article.filter(id__in=[hit.id for hit in hits]).prefetch_related("category")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--articles", type=int, default=50000)
+    parser.add_argument("--words", type=int, default=400, help="words of content per article")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded articles")
+    args = parser.parse_args()
+
+    try:
+        print("Connecting to database...")
+        await Tortoise.init(
+            db_url=settings.DATABASE_URL,
+            modules={"models": ["db.models"]}
+        )
+        await Tortoise.generate_schemas()
+        await apply_schema_extras()
+        conn = connections.get("default")
+
+        category = await Category.first()
+        if not category:
+            category = await Category.create(name="Benchmark", slug="benchmark")
+
+        print(f"Seeding {args.articles} articles...")
+        await conn.execute_query("DELETE FROM articles WHERE slug LIKE 'bench-%'")
+        await conn.execute_query(SEED_SQL, [args.articles, args.words, category.id, WORDS])
+        await conn.execute_script("ANALYZE articles")
+
+        print(f"\n{'query':<20}{'ilike p50':>12}{'ilike p95':>12}{'fts p50':>12}{'fts p95':>12}")
+        for q in QUERIES:
+            ilike = await timed(lambda: ilike_search(q), args.runs)
+            fulltext = await timed(lambda: fulltext_search(q), args.runs)
+            print(f"{q:<20}{ilike[0]:>10.1f}ms{ilike[1]:>10.1f}ms{fulltext[0]:>10.1f}ms{fulltext[1]:>10.1f}ms")
+
+        if not args.keep:
+            await conn.execute_query("DELETE FROM articles WHERE slug LIKE 'bench-%'")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark serializing a page of article list items.
+
+Compares the previous path (an ArticleListItem per row, FastAPI re-validating
+the ArticleListResponse against the response_model, then the standard JSON
+encoder) with services/serialization.py (plain dicts encoded by orjson).
+Runs in memory, no database needed.
+
+Usage: python scripts/bench_serialization.py --items 100 --runs 2000
+"""
+
+import sys
+import asyncio
+import argparse
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the src directory to Python path
+current_dir = Path(__file__).parent
+src_dir = current_dir.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from shemas.article_schemas import ArticleListItem, ArticleListResponse
+from services.serialization import FastJSONResponse, serialize_row
+
+
+CATEGORIES = {1: {"id": 1, "name": "Technology", "slug": "technology"}}
+
+RESPONSE_FIELD = create_model_field(name="Response_get_articles", type_=ArticleListResponse, mode="serialization")
+
+
+def make_rows(count: int) -> list:
+    """Attribute-style rows shaped like Article instances loaded with the list projection"""
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=i,
+            title=f"Benchmark article number {i}",
+            slug=f"benchmark-article-{i}",
+            summary="A short summary of the article, about as long as a real one tends to be.",
+            author=f"Author {i % 50}",
+            status="published",
+            featured_image=f"https://example.com/images/{i}.jpg",
+            views_count=i * 17,
+            likes_count=i * 3,
+            dislikes_count=i % 5,
+            is_featured=i % 4 == 0,
+            is_trending=i % 7 == 0,
+            is_breaking_news=False,
+            published_at=now,
+            created_at=now,
+            category_id=1,
+        )
+        for i in range(count)
+    ]
+
+
+async def render_models(rows: list) -> bytes:
+    """Previous path: model per row, response_model validation, standard JSON encoder"""
+    items = []
+    for article in rows:
+        items.append(ArticleListItem(
+            id=article.id,
+            title=article.title,
+            slug=article.slug,
+            summary=article.summary,
+            author=article.author,
+            status=article.status,
+            featured_image=article.featured_image,
+            views_count=article.views_count,
+            likes_count=article.likes_count,
+            dislikes_count=getattr(article, 'dislikes_count', 0),
+            is_featured=article.is_featured,
+            is_trending=article.is_trending,
+            is_breaking_news=article.is_breaking_news,
+            published_at=article.published_at,
+            created_at=article.created_at,
+            category=CATEGORIES[article.category_id]
+        ))
+    response = ArticleListResponse(items=items, total=len(rows), page=1, limit=len(rows), pages=1)
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=response)
+    return JSONResponse(content).body
+
+
+async def render_fast(rows: list) -> bytes:
+    """services/serialization.py: dicts straight from the rows, encoded by orjson"""
+    items = [serialize_row(ArticleListItem, article, CATEGORIES) for article in rows]
+    return FastJSONResponse(dict(items=items, total=len(rows), page=1, limit=len(rows), pages=1, next_cursor=None)).body
+
+
+async def bench(render, rows: list, runs: int) -> float:
+    """Best-of-3 mean seconds per render"""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(runs):
+            await render(rows)
+        best = min(best, (time.perf_counter() - started) / runs)
+    return best
+
+
+async def main():
+    """Main function to run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark list item serialization")
+    parser.add_argument("--items", type=int, default=100, help="items per page")
+    parser.add_argument("--runs", type=int, default=2000, help="renders per measurement")
+    args = parser.parse_args()
+
+    rows = make_rows(args.items)
+    print(f"Page of {args.items} items, {len(await render_fast(rows))} bytes\n")
+
+    before = await bench(render_models, rows, args.runs)
+    after = await bench(render_fast, rows, args.runs)
+    for label, seconds in (("pydantic + response_model + json", before), ("serialize_row + orjson", after)):
+        print(f"  {label:<34} {seconds * 1000:8.3f} ms/page {seconds / args.items * 1e6:8.2f} µs/item")
+    print(f"\n  {before / after:.1f}x faster")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Check the unique_views HyperLogLog estimates against exact counts.
+
+Seeds readers (IP address, user agent pairs) for a number of articles and
+days with overlapping audiences, builds one sketch per article and day as
+view ingestion does, and compares per-day and merged window estimates with
+the exact distinct counts. Fails if any estimate is off by more than
+``--sigmas`` standard errors (1.04 / sqrt(2 ** precision)).
+Runs in memory, no database needed.
+
+Usage: python scripts/check_unique_views.py --articles 20 --days 14 --precision 12
+"""
+
+import sys
+import argparse
+import random
+from pathlib import Path
+
+# Add the src directory to Python path
+current_dir = Path(__file__).parent
+src_dir = current_dir.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from services.hyperloglog import HyperLogLog
+from services.unique_views import UniqueViews
+
+
+USER_AGENTS = ["Mozilla/5.0 (Windows NT 10.0)", "Mozilla/5.0 (iPhone)", "Mozilla/5.0 (X11; Linux)", "curl/8.0"]
+
+
+def seed(rng: random.Random, articles: int, days: int, max_readers: int) -> list[list[set[tuple[str, str]]]]:
+    """Readers per article and day; returning readers make windows overlap"""
+    seeded = []
+    for _ in range(articles):
+        audience_size = rng.randint(10, max_readers)
+        audience = [
+            (f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}", rng.choice(USER_AGENTS))
+            for _ in range(audience_size)
+        ]
+        seeded.append([set(rng.sample(audience, rng.randint(1, audience_size))) for _ in range(days)])
+    return seeded
+
+
+def sketch(readers: set[tuple[str, str]], precision: int) -> HyperLogLog:
+    result = HyperLogLog(precision)
+    for ip_address, user_agent in readers:
+        result.add_hash(UniqueViews.reader_hash(ip_address, user_agent))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HyperLogLog unique views with exact counts")
+    parser.add_argument("--articles", type=int, default=20)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--max-readers", type=int, default=20000)
+    parser.add_argument("--precision", type=int, default=12)
+    parser.add_argument("--sigmas", type=float, default=4.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    standard_error = HyperLogLog.relative_error(args.precision)
+    print(f"Precision {args.precision}: {1 << args.precision} bytes per sketch, standard error {standard_error:.2%}")
+
+    day_errors, window_errors = [], []
+    for days in seed(rng, args.articles, args.days, args.max_readers):
+        sketches = [sketch(readers, args.precision) for readers in days]
+        for readers, day_sketch in zip(days, sketches):
+            day_errors.append((day_sketch.count() - len(readers)) / len(readers))
+        window_readers = set().union(*days)
+        window_estimate = HyperLogLog.union(sketches, args.precision).count()
+        window_errors.append((window_estimate - len(window_readers)) / len(window_readers))
+
+    failed = False
+    for name, errors in (("per day", day_errors), ("window", window_errors)):
+        rms = (sum(error * error for error in errors) / len(errors)) ** 0.5
+        worst = max(errors, key=abs)
+        print(f"{name:>8}: {len(errors)} estimates, rms error {rms:.2%}, worst {worst:+.2%}")
+        failed |= abs(worst) > args.sigmas * standard_error
+
+    if failed:
+        print(f"FAILED: error above {args.sigmas} standard errors ({args.sigmas * standard_error:.2%})")
+        sys.exit(1)
+    print(f"OK: every estimate within {args.sigmas} standard errors ({args.sigmas * standard_error:.2%})")
+
+
+if __name__ == "__main__":
+    main()
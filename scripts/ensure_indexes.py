@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Script to create missing database indexes on a live database.
+
+Builds every index declared in the models' Meta.indexes (plus the extra
+indexes from db/schema.py) that does not exist yet, using
+CREATE INDEX CONCURRENTLY so reads and writes keep flowing. On a
+partitioned table (article_views) each partition's index is built
+concurrently and attached to the parent index.
+
+Run it before deploying a release that declares new indexes: the app's
+startup generate_schemas would otherwise build them with a plain
+CREATE INDEX, which blocks writes on the table until it finishes.
+
+Usage: python scripts/ensure_indexes.py [--dry-run]
+"""
+
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add the src directory to Python path
+current_dir = Path(__file__).parent
+src_dir = current_dir.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from tortoise import Tortoise
+from db.schema import missing_indexes, create_missing_indexes
+from config import settings
+
+
+async def main():
+    """Main function to connect and build missing indexes."""
+    parser = argparse.ArgumentParser(description="Create missing indexes concurrently")
+    parser.add_argument("--dry-run", action="store_true", help="only list missing indexes")
+    args = parser.parse_args()
+
+    try:
+        print("Connecting to database...")
+        await Tortoise.init(
+            db_url=settings.DATABASE_URL,
+            modules={"models": ["db.models"]}
+        )
+
+        if args.dry_run:
+            missing = await missing_indexes()
+            for name, statement in missing.items():
+                print(f"  • {name}: {statement}")
+            print(f"\n{len(missing)} missing index(es)")
+            return
+
+        created = await create_missing_indexes(
+            on_create=lambda name, statement: print(f"  … building {name}")
+        )
+        print(f"\n✅ Created {len(created)} index(es)")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,20 +1,34 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import Optional, List
 from datetime import datetime
 from math import ceil
 import slugify
+from tortoise.transactions import in_transaction
 
-from db.models import Article, Category, Newsletter, ContentFlag, ArticleView
+from db.models import Article, Category, ContentFlag
 from shemas.article_schemas import (
     ArticleCreate, ArticleUpdate, ArticleResponse, 
     ArticleListResponse, ArticleListItem
 )
 from shemas.admin_schemas import (
     AdminStatsResponse, ContentFlagResponse, 
-    ModerationAction
+    ModerationAction, UniqueViewsResponse, DailyUniqueViews, BulkImportResponse,
+    ArticleBatchUpdate, ArticleBatchDelete, ArticleBatchResponse
 )
 from shemas.category_schemas import CategoryListResponse, CategoryResponse
 from shemas.common_schemas import MessageResponse
+from services.pagination import order_by_sort, apply_cursor, next_cursor, sort_columns
+from services.count_cache import count_cache
+from services.article_hooks import article_state, article_saved, article_deleted
+from services.category_counts import track_article_change
+from services.category_registry import category_registry
+from services.admin_stats import admin_dashboard
+from services.unique_views import unique_views
+from services.bulk_import import BulkImport, csv_rows, ndjson_rows
+from services.article_batch import update_articles, delete_articles
+from services.hyperloglog import HyperLogLog
+from services.projection import parse_fields, columns
+from services.serialization import FastJSONResponse, serialize_row
 from config import settings
 
 router = APIRouter()
@@ -48,66 +62,23 @@ async def get_admin_categories():
 async def get_admin_stats():
     """Get admin dashboard statistics"""
     
-    # Get article counts by status
-    total_articles = await Article.all().count()
-    published_articles = await Article.filter(status="published").count()
-    draft_articles = await Article.filter(status="draft").count()
-    flagged_articles = await Article.filter(status="flagged").count()
-    
-    # Get other stats
-    total_categories = await Category.all().count()
-    newsletter_subscribers = await Newsletter.filter(is_active=True).count()
-    total_views = await ArticleView.all().count()
-    
-    # Get recent articles (last 10)
-    recent_articles_query = await Article.all().order_by("-created_at").limit(10).prefetch_related("category")
-    
-    recent_articles = []
-    for article in recent_articles_query:
-        recent_articles.append(ArticleListItem(
-            id=article.id,
-            title=article.title,
-            slug=article.slug,
-            summary=article.summary,
-            author=article.author,
-            status=article.status,
-            featured_image=article.featured_image,
-            views_count=article.views_count,
-            likes_count=article.likes_count,
-            dislikes_count=getattr(article, 'dislikes_count', 0),
-            is_featured=article.is_featured,
-            is_trending=article.is_trending,
-            is_breaking_news=article.is_breaking_news,
-            published_at=article.published_at,
-            created_at=article.created_at,
-            category={
-                "id": article.category.id,
-                "name": article.category.name,
-                "slug": article.category.slug
-            }
-        ))
-    
-    return AdminStatsResponse(
-        total_articles=total_articles,
-        published_articles=published_articles,
-        draft_articles=draft_articles,
-        flagged_articles=flagged_articles,
-        total_categories=total_categories,
-        newsletter_subscribers=newsletter_subscribers,
-        total_views=total_views,
-        accuracy_rate=95.0,  # Placeholder
-        recent_articles=recent_articles
-    )
+    # Aggregated concurrently and cached briefly, admin writes invalidate it
+    return await admin_dashboard.get()
 
 
 @router.get("/articles", response_model=ArticleListResponse)
 async def get_admin_articles(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
-    status: Optional[str] = Query(None, regex="^(draft|published|archived|flagged)$")
+    status: Optional[str] = Query(None, regex="^(draft|published|archived|flagged)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page, replaces page"),
+    total_mode: str = Query("exact", regex="^(exact|estimate)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return, id is always included")
 ):
     """Get articles for admin management"""
     
+    fields = parse_fields(fields, ArticleListItem)
+    
     # Build query
     query = Article.all()
     
@@ -115,48 +86,35 @@ async def get_admin_articles(
     if status:
         query = query.filter(status=status)
     
-    # Get total count
-    total = await query.count()
+    # Get total count (cached per filter set)
+    total = await count_cache.count(
+        query,
+        count_cache.make_key("admin", status),
+        total_mode
+    )
     
-    # Apply pagination and ordering
-    offset = (page - 1) * limit
-    articles = await query.order_by("-created_at").offset(offset).limit(limit).prefetch_related("category")
+    # Apply ordering and pagination (seek past the cursor if given, offset otherwise)
+    query = order_by_sort(query, "created_at")
+    if cursor:
+        query = apply_cursor(query, "created_at", cursor)
+    else:
+        query = query.offset((page - 1) * limit)
+    articles = await query.limit(limit).only(*columns(ArticleListItem, fields, sort_columns("created_at")))
+    categories = await category_registry.summaries(article.category_id for article in articles)
     
     # Convert to response format
-    items = []
-    for article in articles:
-        items.append(ArticleListItem(
-            id=article.id,
-            title=article.title,
-            slug=article.slug,
-            summary=article.summary,
-            author=article.author,
-            status=article.status,
-            featured_image=article.featured_image,
-            views_count=article.views_count,
-            likes_count=article.likes_count,
-            dislikes_count=getattr(article, 'dislikes_count', 0),
-            is_featured=article.is_featured,
-            is_trending=article.is_trending,
-            is_breaking_news=article.is_breaking_news,
-            published_at=article.published_at,
-            created_at=article.created_at,
-            category={
-                "id": article.category.id,
-                "name": article.category.name,
-                "slug": article.category.slug
-            }
-        ))
+    items = [serialize_row(ArticleListItem, article, categories, fields) for article in articles]
     
     pages = ceil(total / limit)
     
-    return ArticleListResponse(
+    return FastJSONResponse(dict(
         items=items,
         total=total,
         page=page,
         limit=limit,
-        pages=pages
-    )
+        pages=pages,
+        next_cursor=next_cursor(articles, "created_at", limit)
+    ))
 
 
 @router.post("/articles", response_model=ArticleResponse)
@@ -164,7 +122,7 @@ async def create_article(article_data: ArticleCreate):
     """Create new article"""
     
     # Check if category exists
-    category = await Category.get_or_none(id=article_data.category_id)
+    category = await category_registry.get(article_data.category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
@@ -185,24 +143,26 @@ async def create_article(article_data: ArticleCreate):
     # Set published_at if status is published
     published_at = datetime.now() if article_data.status == "published" else None
     
-    # Create article
-    article = await Article.create(
-        title=article_data.title,
-        slug=slug,
-        content=article_data.content,
-        summary=article_data.summary,
-        author=article_data.author,
-        status=article_data.status,
-        meta_description=article_data.meta_description,
-        featured_image=article_data.featured_image,
-        is_featured=article_data.is_featured,
-        is_breaking_news=article_data.is_breaking_news,
-        published_at=published_at,
-        category=category
-    )
-    
-    # Fetch with category data
-    await article.fetch_related("category")
+    # Create article, counted in its category in the same transaction
+    async with in_transaction() as conn:
+        article = await Article.create(
+            title=article_data.title,
+            slug=slug,
+            content=article_data.content,
+            summary=article_data.summary,
+            author=article_data.author,
+            status=article_data.status,
+            meta_description=article_data.meta_description,
+            featured_image=article_data.featured_image,
+            is_featured=article_data.is_featured,
+            is_breaking_news=article_data.is_breaking_news,
+            published_at=published_at,
+            category=category,
+            using_db=conn
+        )
+        await track_article_change(conn, None, article_state(article))
+    
+    await article_saved(article)
     
     return ArticleResponse(
         id=article.id,
@@ -224,81 +184,137 @@ async def create_article(article_data: ArticleCreate):
         published_at=article.published_at,
         created_at=article.created_at,
         updated_at=article.updated_at,
-        category={
-            "id": article.category.id,
-            "name": article.category.name,
-            "slug": article.category.slug
-        }
+        category=await category_registry.summary(article.category_id)
     )
 
 
-@router.put("/articles/{id}", response_model=ArticleResponse)
-async def update_article(id: int, article_data: ArticleUpdate):
-    """Update existing article"""
-    
-    article = await Article.get_or_none(id=id).prefetch_related("category")
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-    
-    # Update fields that are provided
-    update_fields = []
+@router.post("/articles/bulk", response_model=BulkImportResponse)
+async def bulk_import_articles(
+    request: Request,
+    format: Optional[str] = Query(None, regex="^(ndjson|csv)$")
+):
+    """Import articles from an NDJSON or CSV body, parsed as it streams in"""
     
-    if article_data.title is not None:
-        article.title = article_data.title
-        update_fields.append("title")
+    # Format from the query, else the content type (NDJSON by default)
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    parse = csv_rows if format == "csv" else ndjson_rows
     
-    if article_data.content is not None:
-        article.content = article_data.content
-        update_fields.append("content")
+    result = await BulkImport(settings.BULK_IMPORT_BATCH_SIZE).run(parse(request.stream()))
+    return FastJSONResponse(result)
+
+
+def article_set(batch: ArticleBatchDelete) -> tuple[Optional[List[int]], dict]:
+    """The ids and filter columns of a batch request, which must select something"""
+    filters = batch.filter.model_dump(exclude_none=True) if batch.filter else {}
+    if batch.ids is None and not filters:
+        raise HTTPException(status_code=400, detail="Provide ids or a non-empty filter")
+    return batch.ids, filters
+
+
+@router.post("/articles/batch/update", response_model=ArticleBatchResponse)
+async def batch_update_articles(batch: ArticleBatchUpdate):
+    """Change status, featured/breaking flags or category of many articles at once"""
     
-    if article_data.summary is not None:
-        article.summary = article_data.summary
-        update_fields.append("summary")
+    ids, filters = article_set(batch)
+    changes = batch.model_dump(include={"status", "is_featured", "is_breaking_news", "category_id"}, exclude_none=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="No changes given")
     
-    if article_data.author is not None:
-        article.author = article_data.author
-        update_fields.append("author")
+    # Check if category exists
+    if batch.category_id is not None and not await category_registry.get(batch.category_id):
+        raise HTTPException(status_code=404, detail="Category not found")
     
-    if article_data.meta_description is not None:
-        article.meta_description = article_data.meta_description
-        update_fields.append("meta_description")
+    updated = await update_articles(ids, filters, changes)
     
-    if article_data.featured_image is not None:
-        article.featured_image = article_data.featured_image
-        update_fields.append("featured_image")
+    return ArticleBatchResponse(affected=len(updated), ids=updated)
+
+
+@router.post("/articles/batch/delete", response_model=ArticleBatchResponse)
+async def batch_delete_articles(batch: ArticleBatchDelete):
+    """Delete many articles at once"""
     
-    if article_data.is_featured is not None:
-        article.is_featured = article_data.is_featured
-        update_fields.append("is_featured")
+    ids, filters = article_set(batch)
+    deleted = await delete_articles(ids, filters)
     
-    if article_data.is_breaking_news is not None:
-        article.is_breaking_news = article_data.is_breaking_news
-        update_fields.append("is_breaking_news")
+    return ArticleBatchResponse(affected=len(deleted), ids=deleted)
+
+
+@router.put("/articles/{id}", response_model=ArticleResponse)
+async def update_article(id: int, article_data: ArticleUpdate):
+    """Update existing article"""
     
+    category = None
     if article_data.category_id is not None:
-        category = await Category.get_or_none(id=article_data.category_id)
+        category = await category_registry.get(article_data.category_id)
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
-        article.category = category
-        update_fields.append("category")
     
-    if article_data.status is not None:
-        old_status = article.status
-        article.status = article_data.status
-        update_fields.append("status")
+    # The row is locked so concurrent updates read each other's status and
+    # category; the count change commits with the write
+    async with in_transaction() as conn:
+        article = await Article.filter(id=id).select_for_update().using_db(conn).first()
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        before = article_state(article)
+        
+        # Update fields that are provided
+        update_fields = []
+        
+        if article_data.title is not None:
+            article.title = article_data.title
+            update_fields.append("title")
+        
+        if article_data.content is not None:
+            article.content = article_data.content
+            update_fields.append("content")
+        
+        if article_data.summary is not None:
+            article.summary = article_data.summary
+            update_fields.append("summary")
+        
+        if article_data.author is not None:
+            article.author = article_data.author
+            update_fields.append("author")
+        
+        if article_data.meta_description is not None:
+            article.meta_description = article_data.meta_description
+            update_fields.append("meta_description")
+        
+        if article_data.featured_image is not None:
+            article.featured_image = article_data.featured_image
+            update_fields.append("featured_image")
+        
+        if article_data.is_featured is not None:
+            article.is_featured = article_data.is_featured
+            update_fields.append("is_featured")
+        
+        if article_data.is_breaking_news is not None:
+            article.is_breaking_news = article_data.is_breaking_news
+            update_fields.append("is_breaking_news")
+        
+        if category is not None:
+            article.category = category
+            update_fields.append("category_id")
+        
+        if article_data.status is not None:
+            old_status = article.status
+            article.status = article_data.status
+            update_fields.append("status")
         
-        # Set published_at when publishing
-        if old_status != "published" and article_data.status == "published":
-            article.published_at = datetime.now()
-            update_fields.append("published_at")
+            # Set published_at when publishing
+            if old_status != "published" and article_data.status == "published":
+                article.published_at = datetime.now()
+                update_fields.append("published_at")
+        
+        # Update the article
+        if update_fields:
+            update_fields.append("updated_at")
+            await article.save(update_fields=update_fields, using_db=conn)
+            await track_article_change(conn, before, article_state(article))
     
-    # Update the article
     if update_fields:
-        update_fields.append("updated_at")
-        await article.save(update_fields=update_fields)
-    
-    # Ensure category is loaded
-    await article.fetch_related("category")
+        await article_saved(article, before)
     
     return ArticleResponse(
         id=article.id,
@@ -311,6 +327,7 @@ async def update_article(id: int, article_data: ArticleUpdate):
         meta_description=article.meta_description,
         featured_image=article.featured_image,
         views_count=article.views_count,
+        unique_views=article.unique_views,
         likes_count=article.likes_count,
         dislikes_count=getattr(article, 'dislikes_count', 0),
         shares_count=article.shares_count,
@@ -320,11 +337,28 @@ async def update_article(id: int, article_data: ArticleUpdate):
         published_at=article.published_at,
         created_at=article.created_at,
         updated_at=article.updated_at,
-        category={
-            "id": article.category.id,
-            "name": article.category.name,
-            "slug": article.category.slug
-        }
+        category=await category_registry.summary(article.category_id)
+    )
+
+
+@router.get("/articles/{id}/unique-views", response_model=UniqueViewsResponse)
+async def get_article_unique_views(
+    id: int,
+    days: int = Query(settings.UNIQUE_VIEWS_WINDOW_DAYS, ge=1, le=366)
+):
+    """Get estimated distinct readers of an article per day and over the last days"""
+    
+    if not await Article.exists(id=id):
+        raise HTTPException(status_code=404, detail="Article not found")
+    
+    daily = await unique_views.daily(id, days)
+    
+    return UniqueViewsResponse(
+        article_id=id,
+        days=days,
+        unique_views=HyperLogLog.union((sketch for _, sketch in daily), unique_views.precision).count(),
+        relative_error=HyperLogLog.relative_error(unique_views.precision),
+        daily=[DailyUniqueViews(day=day, unique_views=sketch.count()) for day, sketch in daily]
     )
 
 
@@ -332,11 +366,16 @@ async def update_article(id: int, article_data: ArticleUpdate):
 async def delete_article(id: int):
     """Delete article"""
     
-    article = await Article.get_or_none(id=id)
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
+    async with in_transaction() as conn:
+        article = await Article.filter(id=id).select_for_update().using_db(conn).first()
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        
+        before = article_state(article)
+        await article.delete(using_db=conn)
+        await track_article_change(conn, before, None)
     
-    await article.delete()
+    await article_deleted(id, before)
     
     return MessageResponse(
         message="Article deleted successfully",
@@ -383,9 +422,16 @@ async def approve_flagged_content(id: int, action: ModerationAction):
     await flag.save()
     
     # Remove flagged status from article if it was flagged
-    if flag.article.status == "flagged":
-        flag.article.status = "published"  # Or back to previous status
-        await flag.article.save()
+    async with in_transaction() as conn:
+        article = await Article.filter(id=flag.article.id).select_for_update().using_db(conn).first()
+        before = article_state(article)
+        if article.status == "flagged":
+            article.status = "published"  # Or back to previous status
+            await article.save(using_db=conn)
+            await track_article_change(conn, before, article_state(article))
+    
+    if before[0] == "flagged":
+        await article_saved(article, before)
     
     return MessageResponse(
         message="Content approved successfully",
@@ -408,8 +454,14 @@ async def reject_flagged_content(id: int, action: ModerationAction):
     await flag.save()
     
     # Keep article flagged or take other action
-    flag.article.status = "archived"  # Archive rejected content
-    await flag.article.save()
+    async with in_transaction() as conn:
+        article = await Article.filter(id=flag.article.id).select_for_update().using_db(conn).first()
+        before = article_state(article)
+        article.status = "archived"  # Archive rejected content
+        await article.save(using_db=conn)
+        await track_article_change(conn, before, article_state(article))
+    
+    await article_saved(article, before)
     
     return MessageResponse(
         message="Content rejected and archived",
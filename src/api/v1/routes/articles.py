@@ -2,9 +2,16 @@ from fastapi import APIRouter, HTTPException, Request
 from typing import Optional
 from datetime import datetime
 
-from db.models import Article, ArticleView
+from db.models import Article
 from shemas.article_schemas import ArticleResponse
 from shemas.common_schemas import MessageResponse
+from services.view_ingestion import view_ingestion
+from services.engagement import engagement_counters
+from services.category_registry import category_registry
+from services.hot_tracker import hot_tracker
+from services.unique_views import unique_views
+from services.view_dedup import view_dedup
+from config import settings
 
 router = APIRouter()
 
@@ -16,7 +23,7 @@ async def get_article_by_id(id: int, request: Request):
     article = await Article.get_or_none(
         id=id, 
         status="published"
-    ).prefetch_related("category")
+    )
     
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
@@ -25,16 +32,10 @@ async def get_article_by_id(id: int, request: Request):
     client_ip = request.client.host if request.client else "unknown"
     user_agent = request.headers.get("user-agent", "")
     
-    # Create view record
-    await ArticleView.create(
-        article=article,
-        ip_address=client_ip,
-        user_agent=user_agent
-    )
-    
-    # Increment view count
-    article.views_count += 1
-    await article.save(update_fields=["views_count"])
+    # Queue view record unless the reader just viewed it, views_count is incremented on the next flush
+    if not settings.VIEW_DEDUP_ENABLED or view_dedup.first_view(article.id, client_ip, user_agent):
+        view_ingestion.record(article.id, client_ip, user_agent)
+        hot_tracker.record(article.id)
     
     # Return article data
     return ArticleResponse(
@@ -47,21 +48,18 @@ async def get_article_by_id(id: int, request: Request):
         status=article.status,
         meta_description=article.meta_description,
         featured_image=article.featured_image,
-        views_count=article.views_count,
-        likes_count=article.likes_count,
-        dislikes_count=getattr(article, 'dislikes_count', 0),
-        shares_count=article.shares_count,
+        views_count=article.views_count + view_ingestion.pending_views(article.id),
+        unique_views=unique_views.window_count(article.id, article.unique_views),
+        likes_count=article.likes_count + engagement_counters.pending_amount(article.id, "likes_count"),
+        dislikes_count=article.dislikes_count + engagement_counters.pending_amount(article.id, "dislikes_count"),
+        shares_count=article.shares_count + engagement_counters.pending_amount(article.id, "shares_count"),
         is_featured=article.is_featured,
         is_trending=article.is_trending,
         is_breaking_news=article.is_breaking_news,
         published_at=article.published_at,
         created_at=article.created_at,
         updated_at=article.updated_at,
-        category={
-            "id": article.category.id,
-            "name": article.category.name,
-            "slug": article.category.slug
-        }
+        category=await category_registry.summary(article.category_id)
     )
 
 
@@ -69,15 +67,12 @@ async def get_article_by_id(id: int, request: Request):
 async def like_article(id: int):
     """Like an article (increment like count)"""
     
-    article = await Article.get_or_none(id=id, status="published")
-    if not article:
+    likes = await engagement_counters.increment(id, "likes_count")
+    if likes is None:
         raise HTTPException(status_code=404, detail="Article not found")
     
-    article.likes_count += 1
-    await article.save(update_fields=["likes_count"])
-    
     return MessageResponse(
-        message=f"Article liked! Total likes: {article.likes_count}",
+        message=f"Article liked! Total likes: {likes}",
         success=True
     )
 
@@ -86,15 +81,12 @@ async def like_article(id: int):
 async def dislike_article(id: int):
     """Dislike an article (increment dislike count)"""
     
-    article = await Article.get_or_none(id=id, status="published")
-    if not article:
+    dislikes = await engagement_counters.increment(id, "dislikes_count")
+    if dislikes is None:
         raise HTTPException(status_code=404, detail="Article not found")
     
-    article.dislikes_count += 1
-    await article.save(update_fields=["dislikes_count"])
-    
     return MessageResponse(
-        message=f"Article disliked! Total dislikes: {article.dislikes_count}",
+        message=f"Article disliked! Total dislikes: {dislikes}",
         success=True
     )
 
@@ -103,14 +95,11 @@ async def dislike_article(id: int):
 async def share_article(id: int):
     """Share an article (increment share count)"""
     
-    article = await Article.get_or_none(id=id, status="published")
-    if not article:
+    shares = await engagement_counters.increment(id, "shares_count")
+    if shares is None:
         raise HTTPException(status_code=404, detail="Article not found")
     
-    article.shares_count += 1
-    await article.save(update_fields=["shares_count"])
-    
     return MessageResponse(
-        message=f"Article shared! Total shares: {article.shares_count}",
+        message=f"Article shared! Total shares: {shares}",
         success=True
     )
\ No newline at end of file
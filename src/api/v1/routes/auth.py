@@ -1,17 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from tortoise.exceptions import IntegrityError
+from tortoise.expressions import Q
 from datetime import datetime, timedelta
+from uuid import uuid4
 import jwt
 
 from db.models import User, Admin
 from shemas.common_schemas import UserSignup, UserSignin, TokenResponse, UserResponse, MessageResponse
 from config import settings
+from services.site_stats import site_stats
+from services.principal_cache import principal_cache
+from services.passwords import password_hasher
+from services.token_cache import verified_tokens
+from services.token_revocation import token_revocations
 from pydantic import BaseModel
 from typing import Optional
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 class ProfileUpdateRequest(BaseModel):
@@ -31,14 +39,27 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # jti identifies the token for revocation on logout
+    to_encode.update({"exp": expire, "jti": uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def verify_token(token: str) -> dict:
+    """Payload of a valid, unrevoked token, from the verified token cache when possible; raises jwt.PyJWTError"""
+    payload = verified_tokens.get(token)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        verified_tokens.put(token, payload)
+    # In-memory check, no query
+    if token_revocations.is_revoked(payload.get("jti")):
+        raise jwt.InvalidTokenError("Token has been revoked")
+    return payload
+
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = verify_token(credentials.credentials)
         user_id: int = payload.get("sub")
         if user_id is None:
             raise HTTPException(
@@ -46,25 +67,29 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-    except jwt.PyJWTError:
+        # The principal cache is keyed by the integer id
+        user_id = int(user_id)
+    except (jwt.PyJWTError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = await User.get_or_none(id=user_id, is_active=True)
-    if user is None:
+    principal = await principal_cache.get(user_id)
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
+    return principal.user
 
 
 async def get_current_admin(current_user: User = Depends(get_current_user)) -> Admin:
-    admin = await Admin.get_or_none(user=current_user).prefetch_related("user")
+    # Loaded along with the user by get_current_user, no extra query
+    principal = await principal_cache.get(current_user.id)
+    admin = principal.admin if principal else None
     if not admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -84,15 +109,16 @@ async def signup(user_data: UserSignup):
             last_name=user_data.last_name,
             last_login=datetime.utcnow()  # Set last_login on signup since user is auto-logged in
         )
-        user.set_password(user_data.password)
+        user.password_hash = await password_hasher.hash(user_data.password)
         await user.save()
+        await site_stats.add(total_users=1)
         
         # Check if user is admin (you can modify this logic)
         admin = await Admin.get_or_none(user=user).prefetch_related("user")
         is_admin = admin is not None
         
         # Create access token
-        access_token = create_access_token(data={"sub": user.id})
+        access_token = create_access_token(data={"sub": str(user.id)})
         
         return TokenResponse(
             access_token=access_token,
@@ -119,12 +145,14 @@ async def signup(user_data: UserSignup):
 
 @router.post("/signin", response_model=TokenResponse)
 async def signin(user_data: UserSignin):
-    # Find user by username or email
-    user = await User.get_or_none(username=user_data.username)
-    if not user:
-        user = await User.get_or_none(email=user_data.username)
+    # Find user by username or email in one query, a username match wins
+    candidates = await User.filter(Q(username=user_data.username) | Q(email=user_data.username)).limit(2)
+    user = next((candidate for candidate in candidates if candidate.username == user_data.username), None)
+    if not user and candidates:
+        user = candidates[0]
     
-    if not user or not user.verify_password(user_data.password):
+    valid, new_hash = await password_hasher.verify(user_data.password, user.password_hash) if user else (False, None)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -138,16 +166,20 @@ async def signin(user_data: UserSignin):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Update last login
+    # Update last login, and the password hash if it uses outdated bcrypt rounds
     user.last_login = datetime.utcnow()
-    await user.save(update_fields=["last_login"])
+    update_fields = ["last_login"]
+    if new_hash:
+        user.password_hash = new_hash
+        update_fields.append("password_hash")
+    await user.save(update_fields=update_fields)
     
     # Check if user is admin
     admin = await Admin.get_or_none(user=user).prefetch_related("user")
     is_admin = admin is not None
     
     # Create access token
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_access_token(data={"sub": str(user.id)})
     
     return TokenResponse(
         access_token=access_token,
@@ -182,9 +214,16 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/logout", response_model=MessageResponse)
-async def logout():
-    # Since JWT tokens are stateless, logout is handled client-side
-    # In a production system, you might want to implement token blacklisting
+async def logout(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)):
+    # Revoke the token until it expires; without a valid token there is nothing to revoke
+    if credentials is not None:
+        try:
+            payload = verify_token(credentials.credentials)
+        except jwt.PyJWTError:
+            payload = {}
+        if payload.get("jti"):
+            await token_revocations.revoke(payload["jti"], payload["exp"])
+    
     return MessageResponse(
         message="Successfully logged out",
         success=True
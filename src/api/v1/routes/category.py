@@ -2,9 +2,14 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 from math import ceil
 
-from db.models import Article, Category
+from db.models import Article
 from shemas.article_schemas import ArticleListResponse, ArticleListItem
 from shemas.category_schemas import CategoryWithArticlesResponse
+from services.pagination import order_by_sort, apply_cursor, next_cursor, sort_columns
+from services.count_cache import count_cache
+from services.category_registry import category_registry
+from services.projection import parse_fields, columns
+from services.serialization import FastJSONResponse, serialize_row
 from config import settings
 
 router = APIRouter()
@@ -15,68 +20,54 @@ async def get_articles_by_category(
     slug: str,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
-    sort: str = Query("created_at", regex="^(created_at|views_count|title)$")
+    sort: str = Query("created_at", regex="^(created_at|views_count|title)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page, replaces page"),
+    total_mode: str = Query("exact", regex="^(exact|estimate)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return, id is always included")
 ):
     """Get articles for specific category"""
     
+    fields = parse_fields(fields, ArticleListItem)
+    
     # Check if category exists
-    category = await Category.get_or_none(slug=slug)
+    category = await category_registry.get_by_slug(slug)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
     # Build query for published articles in this category
-    query = Article.filter(category=category, status="published")
+    query = Article.filter(category_id=category.id, status="published")
     
-    # Get total count
-    total = await query.count()
+    # Get total count (cached per filter set)
+    total = await count_cache.count(
+        query,
+        count_cache.make_key("category", "published", [slug]),
+        total_mode
+    )
     
     # Apply sorting
-    if sort == "created_at":
-        query = query.order_by("-created_at")
-    elif sort == "views_count":
-        query = query.order_by("-views_count")
-    elif sort == "title":
-        query = query.order_by("title")
+    query = order_by_sort(query, sort)
     
-    # Apply pagination
-    offset = (page - 1) * limit
-    articles = await query.offset(offset).limit(limit).prefetch_related("category")
+    # Apply pagination (seek past the cursor if given, offset otherwise)
+    if cursor:
+        query = apply_cursor(query, sort, cursor)
+    else:
+        query = query.offset((page - 1) * limit)
+    articles = await query.limit(limit).only(*columns(ArticleListItem, fields, sort_columns(sort)))
+    categories = await category_registry.summaries([category.id])
     
     # Convert to response format
-    items = []
-    for article in articles:
-        items.append(ArticleListItem(
-            id=article.id,
-            title=article.title,
-            slug=article.slug,
-            summary=article.summary,
-            author=article.author,
-            status=article.status,
-            featured_image=article.featured_image,
-            views_count=article.views_count,  
-            likes_count=article.likes_count,
-            dislikes_count=getattr(article, 'dislikes_count', 0),
-            is_featured=article.is_featured,
-            is_trending=article.is_trending,
-            is_breaking_news=article.is_breaking_news,
-            published_at=article.published_at,
-            created_at=article.created_at,
-            category={
-                "id": article.category.id,
-                "name": article.category.name,
-                "slug": article.category.slug
-            }
-        ))
+    items = [serialize_row(ArticleListItem, article, categories, fields) for article in articles]
     
     pages = ceil(total / limit)
     
-    return ArticleListResponse(
+    return FastJSONResponse(dict(
         items=items,
         total=total,
         page=page,
         limit=limit,
-        pages=pages
-    )
+        pages=pages,
+        next_cursor=next_cursor(articles, sort, limit)
+    ))
 
 
 @router.get("/{slug}", response_model=CategoryWithArticlesResponse)
@@ -87,41 +78,19 @@ async def get_category_with_articles(
     """Get category with recent articles"""
     
     # Get category
-    category = await Category.get_or_none(slug=slug)
+    category = await category_registry.get_by_slug(slug)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
     # Get recent articles for this category
     articles = await Article.filter(
-        category=category, 
+        category_id=category.id, 
         status="published"
-    ).order_by("-created_at").limit(limit).prefetch_related("category")
+    ).order_by("-created_at").limit(limit).only(*columns(ArticleListItem))
+    categories = await category_registry.summaries([category.id])
     
     # Convert articles to response format
-    article_items = []
-    for article in articles:
-        article_items.append(ArticleListItem(
-            id=article.id,
-            title=article.title,
-            slug=article.slug,
-            summary=article.summary,
-            author=article.author,
-            status=article.status,
-            featured_image=article.featured_image,
-            views_count=article.views_count,  
-            likes_count=article.likes_count,
-            dislikes_count=getattr(article, 'dislikes_count', 0),
-            is_featured=article.is_featured,
-            is_trending=article.is_trending,
-            is_breaking_news=article.is_breaking_news,
-            published_at=article.published_at,
-            created_at=article.created_at,
-            category={
-                "id": article.category.id,
-                "name": article.category.name,
-                "slug": article.category.slug
-            }
-        ))
+    article_items = [serialize_row(ArticleListItem, article, categories) for article in articles]
     
     return CategoryWithArticlesResponse(
         id=category.id,
@@ -1,13 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional, List
-from tortoise.queryset import Q
 from math import ceil
 
-from db.models import Article, Category, Newsletter, SiteStats, ArticleView
+from db.models import Article, Category, Newsletter
 from shemas.article_schemas import ArticleListResponse, ArticleListItem, TrendingArticleResponse
 from shemas.category_schemas import CategoryListResponse, CategoryResponse
 from shemas.newsletter_schemas import NewsletterSubscribe, NewsletterResponse
-from shemas.common_schemas import StatsResponse, SearchResponse, MessageResponse
+from shemas.common_schemas import StatsResponse, SearchResponse, SearchResultItem, SuggestResponse, MessageResponse
+from services.pagination import order_by_sort, apply_cursor, decode_cursor, next_cursor, sort_columns
+from services.search import search_backend, TextSearchMatch
+from services.suggest import suggest_index, MAX_SUGGESTIONS
+from services.count_cache import count_cache
+from services.site_stats import site_stats
+from services.trending import trending_engine
+from services.hot_tracker import hot_tracker
+from services.category_registry import category_registry
+from services.projection import parse_fields, columns
+from services.serialization import FastJSONResponse, serialize_row
 from config import settings
 
 router = APIRouter()
@@ -19,80 +28,57 @@ async def get_articles(
     limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
     category: Optional[List[str]] = Query(None),
     search: Optional[str] = None,
-    sort: str = Query("created_at", regex="^(created_at|views_count|title|featured)$")
+    sort: str = Query("created_at", regex="^(created_at|views_count|title|featured)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page, replaces page"),
+    total_mode: str = Query("exact", regex="^(exact|estimate)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return, id is always included")
 ):
     """Get all published articles with pagination and filtering"""
     
+    fields = parse_fields(fields, ArticleListItem)
+    
     # Build query
     query = Article.filter(status="published")
     
     # Add category filter (OR logic for multiple categories)
     if category:
-        category_q = Q()
-        for cat in category:
-            category_q |= Q(category__slug=cat)
-        query = query.filter(category_q)
+        query = query.filter(category_id__in=await category_registry.ids_for_slugs(category))
     
-    # Add search filter
+    # Add full-text search filter
     if search:
-        query = query.filter(
-            Q(title__icontains=search) | 
-            Q(content__icontains=search) |
-            Q(summary__icontains=search)
-        )
+        query = query.annotate(search_match=TextSearchMatch(search)).filter(search_match=True)
     
-    # Get total count
-    total = await query.count()
+    # Get total count (cached per filter set)
+    total = await count_cache.count(
+        query,
+        count_cache.make_key("articles", "published", category, search),
+        total_mode
+    )
     
     # Apply sorting
-    if sort == "created_at":
-        query = query.order_by("-created_at")
-    elif sort == "views_count":
-        query = query.order_by("-views_count")
-    elif sort == "title":
-        query = query.order_by("title")
-    elif sort == "featured":
-        query = query.order_by("-is_featured", "-created_at")
+    query = order_by_sort(query, sort)
     
-    # Apply pagination
-    offset = (page - 1) * limit
-    articles = await query.offset(offset).limit(limit).prefetch_related("category")
+    # Apply pagination (seek past the cursor if given, offset otherwise)
+    if cursor:
+        query = apply_cursor(query, sort, cursor)
+    else:
+        query = query.offset((page - 1) * limit)
+    articles = await query.limit(limit).only(*columns(ArticleListItem, fields, sort_columns(sort)))
+    categories = await category_registry.summaries(article.category_id for article in articles)
     
     # Convert to response format
-    items = []
-    for article in articles:
-        items.append(ArticleListItem(
-            id=article.id,
-            title=article.title,
-            slug=article.slug,
-            summary=article.summary,
-            author=article.author,
-            status=article.status,
-            featured_image=article.featured_image,
-            views_count=article.views_count,
-            likes_count=article.likes_count,
-            dislikes_count=getattr(article, 'dislikes_count', 0),
-            is_featured=article.is_featured,
-            is_trending=article.is_trending,
-            is_breaking_news=article.is_breaking_news,
-            published_at=article.published_at,
-            created_at=article.created_at,
-            category={
-                "id": article.category.id,
-                "name": article.category.name,
-                "slug": article.category.slug
-            }
-        ))
+    items = [serialize_row(ArticleListItem, article, categories, fields) for article in articles]
     
     pages = ceil(total / limit)
     
-    return ArticleListResponse(
+    return FastJSONResponse(dict(
         items=items,
         total=total,
         page=page,
         limit=limit,
-        pages=pages
-    )
+        pages=pages,
+        next_cursor=next_cursor(articles, sort, limit)
+    ))
 
 
 @router.get("/categories", response_model=CategoryListResponse)
@@ -103,7 +89,6 @@ async def get_categories():
     items = []
     
     for category in categories:
-        article_count = await Article.filter(category=category, status="published").count()
         items.append(CategoryResponse(
             id=category.id,
             name=category.name,
@@ -111,7 +96,7 @@ async def get_categories():
             description=category.description,
             created_at=category.created_at,
             updated_at=category.updated_at,
-            article_count=article_count
+            article_count=category.published_article_count
         ))
     
     return CategoryListResponse(
@@ -128,8 +113,6 @@ async def get_category_by_slug(slug: str):
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
-    article_count = await Article.filter(category=category, status="published").count()
-    
     return CategoryResponse(
         id=category.id,
         name=category.name,
@@ -137,7 +120,7 @@ async def get_category_by_slug(slug: str):
         description=category.description,
         created_at=category.created_at,
         updated_at=category.updated_at,
-        article_count=article_count
+        article_count=category.published_article_count
     )
 
 
@@ -145,64 +128,45 @@ async def get_category_by_slug(slug: str):
 async def get_stats():
     """Get platform statistics"""
     
-    # Calculate real-time stats
-    total_articles = await Article.filter(status="published").count()
-    total_views = await ArticleView.all().count()
-    
-    # Try to get existing stats for accuracy rate, or use default
-    stats = await SiteStats.first()
-    accuracy_rate = stats.accuracy_rate if stats else 95.0
-    
-    # Update or create stats record
-    if stats:
-        stats.total_articles = total_articles
-        stats.total_views = total_views
-        await stats.save(update_fields=["total_articles", "total_views", "last_updated"])
-    else:
-        stats = await SiteStats.create(
-            total_articles=total_articles,
-            total_users=0,  # Will be implemented when user system is added
-            total_views=total_views,
-            accuracy_rate=accuracy_rate
-        )
+    # Materialized stats row (maintained by services/site_stats.py), cached briefly
+    stats = await site_stats.get()
     
     return StatsResponse(
-        total_articles=total_articles,
-        total_users=0,  # Will be implemented when user system is added
-        accuracy_rate=accuracy_rate
+        total_articles=stats.total_articles,
+        total_users=stats.total_users,
+        accuracy_rate=stats.accuracy_rate
     )
 
 
 @router.get("/trending", response_model=List[TrendingArticleResponse])
-async def get_trending_articles(limit: int = Query(10, ge=1, le=50)):
-    """Get trending articles"""
+async def get_trending_articles(
+    limit: int = Query(10, ge=1, le=settings.TRENDING_RANKING_SIZE),
+    window: Optional[str] = Query(None, regex="^(5m|1h)$", description="Rank by views in this sliding window, in real time"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, id is always included")
+):
+    """Get trending articles (ranked by time-decayed recent views, or hot right now with window)"""
     
-    articles = await Article.filter(
-        status="published",
-        is_trending=True
-    ).order_by("-views_count").limit(limit).prefetch_related("category")
+    fields = parse_fields(fields, TrendingArticleResponse)
     
-    results = []
-    for article in articles:
-        results.append(TrendingArticleResponse(
-            id=article.id,
-            title=article.title,
-            slug=article.slug,
-            summary=article.summary,
-            author=article.author,
-            featured_image=article.featured_image,
-            views_count=article.views_count,
-            likes_count=article.likes_count,
-            dislikes_count=getattr(article, 'dislikes_count', 0),
-            published_at=article.published_at,
-            category={
-                "id": article.category.id,
-                "name": article.category.name,
-                "slug": article.category.slug
-            }
-        ))
+    if window:
+        # Heavy hitters of the live view stream (services/hot_tracker.py),
+        # over-fetched since they may include unpublished articles
+        ranking = [article_id for article_id, _ in hot_tracker.top(window, settings.TRENDING_RANKING_SIZE)]
+    else:
+        # Precomputed ranking, refreshed in the background by services/trending.py
+        ranking = trending_engine.top(limit)
+    
+    rows = await Article.filter(
+        id__in=ranking,
+        status="published"
+    ).only(*columns(TrendingArticleResponse, fields))
+    rows_by_id = {article.id: article for article in rows}
+    articles = [rows_by_id[article_id] for article_id in ranking if article_id in rows_by_id][:limit]
+    categories = await category_registry.summaries(article.category_id for article in articles)
     
-    return results
+    results = [serialize_row(TrendingArticleResponse, article, categories, fields) for article in articles]
+    
+    return FastJSONResponse(results)
 
 
 @router.get("/search", response_model=SearchResponse)
@@ -210,59 +174,57 @@ async def search_articles(
     q: str = Query(..., min_length=settings.SEARCH_MIN_QUERY_LENGTH),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=settings.MAX_SEARCH_RESULTS),
-    category: Optional[List[str]] = Query(None)
+    category: Optional[List[str]] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous page, replaces page"),
+    total_mode: str = Query("exact", regex="^(exact|estimate)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated result fields to return, id is always included")
 ):
-    """Search articles"""
+    """Search articles (full-text, ranked by relevance)"""
     
-    # Build search query
-    query = Article.filter(
-        status="published"
-    ).filter(
-        Q(title__icontains=q) | 
-        Q(content__icontains=q) |
-        Q(summary__icontains=q) |
-        Q(author__icontains=q)
-    )
+    fields = parse_fields(fields, SearchResultItem)
     
-    # Add category filter (OR logic for multiple categories)
-    if category:
-        category_q = Q()
-        for cat in category:
-            category_q |= Q(category__slug=cat)
-        query = query.filter(category_q)
+    # Get ranked page of hits (seek past the cursor if given, offset otherwise)
+    hits = await search_backend.search(
+        q,
+        category,
+        limit,
+        offset=0 if cursor else (page - 1) * limit,
+        after=decode_cursor(cursor, "rank") if cursor else None
+    )
     
-    # Get total count
-    total = await query.count()
+    # Get total count (cached per filter set)
+    total = await count_cache.resolve(
+        count_cache.make_key("search", "published", category, q),
+        lambda: search_backend.count(q, category),
+        lambda: search_backend.estimate(q, category),
+        total_mode
+    )
     
-    # Apply pagination
-    offset = (page - 1) * limit
-    articles = await query.offset(offset).limit(limit).prefetch_related("category")
+    # Convert to response format, keeping rank order
+    results = await search_backend.results(hits, fields)
     
-    # Convert to response format
-    results = []
-    for article in articles:
-        results.append({
-            "id": article.id,
-            "title": article.title,
-            "slug": article.slug,
-            "summary": article.summary,
-            "author": article.author,
-            "featured_image": article.featured_image,
-            "views_count": article.views_count,
-            "published_at": article.published_at,
-            "category": {
-                "id": article.category.id,
-                "name": article.category.name,
-                "slug": article.category.slug
-            }
-        })
-    
-    return SearchResponse(
+    return FastJSONResponse(dict(
         query=q,
         results=results,
         total=total,
         page=page,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor(hits, "rank", limit)
+    ))
+
+
+@router.get("/search/suggest", response_model=SuggestResponse)
+async def suggest_search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(8, ge=1, le=MAX_SUGGESTIONS)
+):
+    """Search-as-you-type suggestions from article titles, categories and authors"""
+    
+    suggestions = suggest_index.suggest(q, limit)
+    
+    return SuggestResponse(
+        query=q,
+        suggestions=[suggestion._asdict() for suggestion in suggestions]
     )
 
 
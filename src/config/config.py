@@ -8,6 +8,17 @@ class Settings(BaseSettings):
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
+    # Authenticated users and admin profiles cached per process
+    AUTH_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_TOKEN_CACHE_ENABLED: bool = True  # verified JWT payloads, skips jwt.decode on repeat tokens
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_REVOCATION_SYNC_SECONDS: float = 5.0  # how long other workers may accept a revoked token
+    # Password hashing runs in a thread pool; changing the rounds rehashes on signin
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5.0
     
     # API Configuration
     API_V1_STR: str = "/api"
@@ -34,6 +45,8 @@ class Settings(BaseSettings):
     MAX_ARTICLE_TITLE_LENGTH: int = 200
     MAX_ARTICLE_CONTENT_LENGTH: int = 50000
     MAX_CATEGORY_NAME_LENGTH: int = 100
+    CATEGORY_REFRESH_SECONDS: float = 60.0
+    CATEGORY_COUNTS_REFRESH_SECONDS: float = 3600.0  # recount of published_article_count
     
     # Newsletter
     MAX_NEWSLETTER_EMAILS: int = 100000
@@ -41,10 +54,58 @@ class Settings(BaseSettings):
     # Search
     MAX_SEARCH_RESULTS: int = 100
     SEARCH_MIN_QUERY_LENGTH: int = 2
+    SEARCH_BACKEND: str = "postgres"  # "postgres" (full-text) or "memory" (in-process BM25)
+    SEARCH_INDEX_REFRESH_SECONDS: float = 300.0  # rebuild of the "memory" index, picks up other workers' writes
+    SUGGEST_MAX_SCAN: int = 2000  # prefixes matching more keys use a cached ranking
+    SUGGEST_REFRESH_SECONDS: float = 300.0
+    
+    # Platform stats (/api/stats)
+    STATS_REFRESH_SECONDS: float = 3600.0  # full recount from the source tables
+    STATS_MAX_STALENESS_SECONDS: float = 30.0
+    ADMIN_STATS_TTL_SECONDS: float = 10.0
+    
+    # Bulk article import (/api/admin/articles/bulk)
+    BULK_IMPORT_BATCH_SIZE: int = 1000  # rows validated and inserted per statement
     
     # Trending articles
     TRENDING_ARTICLES_LIMIT: int = 10
     TRENDING_DAYS_THRESHOLD: int = 7
+    TRENDING_HALF_LIFE_HOURS: float = 24.0
+    TRENDING_REFRESH_SECONDS: float = 60.0
+    TRENDING_RANKING_SIZE: int = 50
+    # Real-time hot articles (/api/trending?window=5m|1h)
+    HOT_TRACKER_CAPACITY: int = 200  # counters per time bucket
+    HOT_TRACKER_BUCKET_SECONDS: int = 60
+    HOT_TRACKER_SNAPSHOT_SECONDS: float = 30.0
+    
+    # View ingestion (a crash loses at most one buffer / one interval of views)
+    VIEW_BUFFER_MAX_SIZE: int = 1000
+    VIEW_FLUSH_INTERVAL_SECONDS: float = 5.0
+    # Raw views are kept in daily partitions for VIEW_RETENTION_DAYS (at least the
+    # trending window), older days only survive as article_view_daily rollups
+    VIEW_RETENTION_DAYS: int = 30
+    VIEW_PARTITIONS_AHEAD_DAYS: int = 3
+    VIEW_ROLLUP_INTERVAL_SECONDS: float = 3600.0
+    # Repeat views of an article by the same reader within the window are not recorded
+    VIEW_DEDUP_ENABLED: bool = True
+    VIEW_DEDUP_WINDOW_SECONDS: float = 1800.0
+    VIEW_DEDUP_CAPACITY: int = 1_000_000  # keys per filter, two filters of ~1.8 MB at 0.1%
+    VIEW_DEDUP_ERROR_RATE: float = 0.001
+    # Unique readers (HyperLogLog, relative standard error 1.04 / sqrt(2 ** precision))
+    UNIQUE_VIEWS_PRECISION: int = 12
+    UNIQUE_VIEWS_WINDOW_DAYS: int = 30  # window of the unique_views article field
+    UNIQUE_VIEWS_CACHE_SECONDS: float = 60.0  # an article's stored count is refreshed at most this often per worker
+    UNIQUE_VIEWS_CACHE_MAX_ENTRIES: int = 4096
+    UNIQUE_VIEWS_REFRESH_SECONDS: float = 5.0  # background refresh of the viewed articles' stored counts
+    
+    # Engagement counters (merge like/dislike/share increments in memory)
+    ENGAGEMENT_COALESCE_WRITES: bool = False
+    ENGAGEMENT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    
+    # List totals (cached COUNTs; planner estimates above the threshold with total_mode=estimate)
+    COUNT_CACHE_TTL_SECONDS: float = 30.0
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+    COUNT_ESTIMATE_THRESHOLD: int = 10000
     
     # File uploads (if needed later)
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
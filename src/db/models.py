@@ -2,7 +2,16 @@ from tortoise.models import Model
 from tortoise import fields
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from config import settings
+
+# Hashes with other rounds than configured are replaced on the next signin
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
 
 
 class User(Model):
@@ -24,6 +33,7 @@ class User(Model):
     class Meta:
         table = "users"
         
+    # Blocking, request handlers use services.passwords.password_hasher
     def set_password(self, password: str):
         self.password_hash = pwd_context.hash(password)
     
@@ -56,6 +66,21 @@ class Admin(Model):
         return f"Admin: {self.user.username}"
 
 
+class RevokedToken(Model):
+    """Access token revoked before its expiry, by jti claim (services/token_revocation.py)"""
+    id = fields.IntField(pk=True)
+    jti = fields.CharField(max_length=64, unique=True)
+    expires_at = fields.DatetimeField()  # the token's exp, the row is pruned after it
+    revoked_at = fields.DatetimeField(auto_now_add=True)
+    
+    class Meta:
+        table = "revoked_tokens"
+        indexes = (
+            ("expires_at",),
+            ("revoked_at",),
+        )
+
+
 class Moderation(Model):
     id = fields.IntField(pk=True)
     
@@ -97,6 +122,9 @@ class Category(Model):
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
     
+    # Maintained on article writes (services/category_counts.py)
+    published_article_count = fields.IntField(default=0)
+    
     # Reverse relation to articles
     articles: fields.ReverseRelation["Article"]
     
@@ -134,6 +162,7 @@ class Article(Model):
     likes_count = fields.IntField(default=0)
     dislikes_count = fields.IntField(default=0)
     shares_count = fields.IntField(default=0)
+    unique_views = fields.IntField(default=0)  # Estimated distinct readers, refreshed by services/unique_views.py
     
     # Content flags
     is_featured = fields.BooleanField(default=False)
@@ -151,6 +180,15 @@ class Article(Model):
     class Meta:
         table = "articles"
         ordering = ["-created_at"]
+        # One composite index per hot query shape: public listings filter on
+        # status and order by a sort key (id is the pagination tie-breaker)
+        indexes = (
+            ("status", "created_at", "id"),
+            ("status", "category_id", "created_at", "id"),
+            ("status", "views_count", "id"),
+            ("status", "is_featured", "created_at", "id"),
+            ("status", "is_trending", "views_count"),
+        )
         
     def __str__(self):
         return self.title
@@ -171,6 +209,10 @@ class Newsletter(Model):
 
 
 class ArticleView(Model):
+    """
+    One row per view. The table is range-partitioned by day on viewed_at with
+    primary key (id, viewed_at), see services/view_rollup.py
+    """
     id = fields.IntField(pk=True)
     article = fields.ForeignKeyField("models.Article", related_name="article_views")
     ip_address = fields.CharField(max_length=45)
@@ -179,6 +221,35 @@ class ArticleView(Model):
     
     class Meta:
         table = "article_views"
+        indexes = (
+            ("article_id", "viewed_at"),
+            ("viewed_at",),
+        )
+
+
+class ArticleViewDaily(Model):
+    """Views of an article per UTC day, rolled up from closed article_views partitions"""
+    id = fields.IntField(pk=True)
+    article = fields.ForeignKeyField("models.Article", related_name="daily_views")
+    day = fields.DateField()
+    views = fields.IntField(default=0)
+    unique_ips = fields.IntField(default=0)
+    
+    class Meta:
+        table = "article_view_daily"
+        unique_together = (("article", "day"),)
+
+
+class ArticleUniqueViews(Model):
+    """HyperLogLog sketch of an article's distinct readers (IP and user agent) per UTC day"""
+    id = fields.IntField(pk=True)
+    article = fields.ForeignKeyField("models.Article", related_name="unique_view_sketches")
+    day = fields.DateField()
+    registers = fields.BinaryField()
+    
+    class Meta:
+        table = "article_unique_views"
+        unique_together = (("article", "day"),)
 
 
 class ContentFlag(Model):
@@ -206,6 +277,38 @@ class ContentFlag(Model):
         return f"Flag for {self.article.title} - {self.reason}"
 
 
+class TrendingScore(Model):
+    """Forward-decayed view score of an article over the trending window (services/trending.py)"""
+    article = fields.OneToOneField("models.Article", related_name="trending_score", pk=True)
+    score = fields.FloatField(default=0)
+    
+    class Meta:
+        table = "trending_scores"
+
+
+class TrendingState(Model):
+    """Progress of the incremental trending recompute, a single row"""
+    id = fields.IntField(pk=True)
+    epoch = fields.FloatField()  # Unix time the stored scores are relative to
+    window_start = fields.DatetimeField()  # Views before this have been expired from the scores
+    
+    class Meta:
+        table = "trending_state"
+
+
+class HotViewBucket(Model):
+    """Snapshot of one time bucket of the in-memory hot articles tracker (services/hot_tracker.py)"""
+    id = fields.IntField(pk=True)
+    bucket_start = fields.DatetimeField()
+    article_id = fields.IntField()
+    views = fields.IntField()
+    error = fields.IntField(default=0)  # Space-Saving overestimation bound of views
+    
+    class Meta:
+        table = "hot_view_buckets"
+        unique_together = (("bucket_start", "article_id"),)
+
+
 class SiteStats(Model):
     id = fields.IntField(pk=True)
     total_articles = fields.IntField(default=0)
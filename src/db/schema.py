@@ -0,0 +1,148 @@
+import re
+from hashlib import blake2b
+
+from tortoise import connections
+from tortoise.utils import get_schema_sql
+
+
+# Text search configuration used by the search_vector column and all queries on it
+SEARCH_CONFIG = "english"
+
+# Weighted document: title (A) > summary (B) > content (C) > author (D)
+SEARCH_VECTOR_SQL = f"""
+    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(summary, '')), 'B') ||
+    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'C') ||
+    setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(author, '')), 'D')
+"""
+
+# Objects generate_schemas cannot create on an existing database; every statement is idempotent
+SCHEMA_EXTRAS = [
+    f"""
+    ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED
+    """,
+    # Added after the categories table shipped, generate_schemas cannot add it
+    """
+    ALTER TABLE categories ADD COLUMN IF NOT EXISTS published_article_count INT NOT NULL DEFAULT 0
+    """,
+    """
+    ALTER TABLE articles ADD COLUMN IF NOT EXISTS unique_views INT NOT NULL DEFAULT 0
+    """,
+]
+
+EXTRA_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS "idx_articles_search_vector" ON "articles" USING GIN ("search_vector");',
+]
+
+INDEX_NAME_RE = re.compile(r'^CREATE INDEX IF NOT EXISTS "(?P<name>[^"]+)"')
+INDEX_TABLE_RE = re.compile(r'^CREATE INDEX IF NOT EXISTS "(?P<name>[^"]+)" ON "(?P<table>[^"]+)"(?P<rest>.*)$', re.S)
+
+EXISTING_INDEXES_SQL = """
+SELECT c.relname AS name, i.indisvalid AS valid
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = current_schema()
+"""
+
+
+# Partitions of a partitioned table, empty for any other table
+PARTITIONS_SQL = """
+SELECT c.relname AS name
+FROM pg_class p
+JOIN pg_inherits i ON i.inhparent = p.oid
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE p.relname = $1 AND p.relkind = 'p' AND p.relnamespace = current_schema()::regnamespace
+ORDER BY c.relname
+"""
+
+IS_PARTITIONED_SQL = """
+SELECT 1 FROM pg_class WHERE relname = $1 AND relkind = 'p' AND relnamespace = current_schema()::regnamespace
+"""
+
+
+async def apply_schema_extras():
+    """Create database objects that generate_schemas does not manage"""
+    conn = connections.get("default")
+    for statement in SCHEMA_EXTRAS + EXTRA_INDEXES:
+        await conn.execute_script(statement)
+
+
+def declared_indexes() -> dict[str, str]:
+    """CREATE INDEX statement by index name, for the model Meta.indexes and EXTRA_INDEXES"""
+    schema_sql = get_schema_sql(connections.get("default"), safe=True)
+    indexes = {}
+    for statement in schema_sql.splitlines() + EXTRA_INDEXES:
+        match = INDEX_NAME_RE.match(statement.strip())
+        if match:
+            indexes[match.group("name")] = statement.strip()
+    return indexes
+
+
+async def existing_indexes() -> dict[str, bool]:
+    """Index names in the current schema and whether each one is valid"""
+    rows = await connections.get("default").execute_query_dict(EXISTING_INDEXES_SQL)
+    return {row["name"]: row["valid"] for row in rows}
+
+
+async def missing_indexes() -> dict[str, str]:
+    """Declared indexes that do not exist yet or were left invalid by a failed build"""
+    existing = await existing_indexes()
+    return {
+        name: statement for name, statement in declared_indexes().items()
+        if not existing.get(name)
+    }
+
+
+async def create_missing_indexes(on_create=None) -> list[str]:
+    """
+    Build missing indexes with CREATE INDEX CONCURRENTLY, which does not block
+    writes on a live database. Must run outside a transaction.
+    """
+    conn = connections.get("default")
+    existing = await existing_indexes()
+
+    created = []
+    for name, statement in (await missing_indexes()).items():
+        if on_create:
+            on_create(name, statement)
+        match = INDEX_TABLE_RE.match(statement)
+        if match and await conn.execute_query_dict(IS_PARTITIONED_SQL, [match.group("table")]):
+            await _create_partitioned_index(match, existing)
+        else:
+            if name in existing:
+                # Invalid leftover of an interrupted concurrent build
+                await conn.execute_script(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+            await conn.execute_script(statement.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1))
+        created.append(name)
+    return created
+
+
+def partition_index_name(partition: str, index: str) -> str:
+    name = f"{partition}_{index}"
+    if len(name) > 63:
+        name = f"{partition}_{blake2b(index.encode(), digest_size=6).hexdigest()}"
+    return name
+
+
+async def _create_partitioned_index(match: re.Match, existing: dict[str, bool]):
+    """
+    CREATE INDEX CONCURRENTLY is not supported on a partitioned table: create
+    the parent index ON ONLY the parent (invalid until every partition has
+    its index), build each partition's index concurrently and attach it.
+    Partitions created later get the index from the parent.
+    """
+    conn = connections.get("default")
+    name, table, rest = match.group("name"), match.group("table"), match.group("rest")
+
+    await conn.execute_script(f'CREATE INDEX IF NOT EXISTS "{name}" ON ONLY "{table}"{rest}')
+    for row in await conn.execute_query_dict(PARTITIONS_SQL, [table]):
+        partition_index = partition_index_name(row["name"], name)
+        if existing.get(partition_index) is False:
+            await conn.execute_script(f'DROP INDEX CONCURRENTLY IF EXISTS "{partition_index}"')
+        await conn.execute_script(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{partition_index}" ON "{row["name"]}"{rest}'
+        )
+        # Attaching an index that is already attached to this parent is a no-op
+        await conn.execute_script(f'ALTER INDEX "{name}" ATTACH PARTITION "{partition_index}"')
@@ -9,6 +9,21 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from tortoise.contrib.fastapi import RegisterTortoise, tortoise_exception_handlers
 from db.models import Category
+from db.schema import apply_schema_extras
+from services.view_ingestion import view_ingestion
+from services.engagement import engagement_counters
+from services.search import search_backend
+from services.suggest import suggest_index
+from services.category_counts import refresh_published_counts, published_counts
+from services.category_registry import category_registry
+from services.serialization import FastJSONResponse
+from services.site_stats import site_stats
+from services.trending import trending_engine
+from services.hot_tracker import hot_tracker
+from services.view_rollup import view_rollup
+from services.passwords import password_hasher
+from services.token_revocation import token_revocations
+from services.unique_views import unique_views
 
 
 DEFAULT_CATEGORIES = [
@@ -40,13 +55,72 @@ async def lifespan(app: FastAPI):
         timezone="UTC",
         generate_schemas=True,
     ):
+        # Full-text search column and indexes that generate_schemas cannot create
+        await apply_schema_extras()
+        
+        # Partition article_views by day and create the upcoming partitions
+        await view_rollup.setup()
+        
         # Seed default categories on startup
         await seed_default_categories()
-        yield
+        
+        # Resync materialized per-category article counts
+        await refresh_published_counts()
+        
+        # Make sure the stats row exists and is not older than its refresh interval
+        await site_stats.refresh(max_age=settings.STATS_REFRESH_SECONDS)
+        
+        # Restore the real-time hot articles tracker from its last snapshot
+        await hot_tracker.restore()
+        
+        # Load the revoked access tokens checked by get_current_user
+        await token_revocations.load()
+        
+        # Load the category registry used by filters and response builders
+        await category_registry.load()
+        
+        # Build the in-process search index, if the backend keeps one
+        await search_backend.build()
+        await suggest_index.build()
+        
+        view_ingestion.start()
+        engagement_counters.start()
+        suggest_index.start()
+        search_backend.start()
+        category_registry.start()
+        site_stats.start()
+        published_counts.start()
+        # First trending recompute runs in the background right away
+        trending_engine.start()
+        trending_engine.request_flush()
+        hot_tracker.start()
+        # Roll up the days that closed while the app was down
+        view_rollup.start()
+        view_rollup.request_flush()
+        token_revocations.start()
+        unique_views.start()
+        try:
+            yield
+        finally:
+            # Flush buffered writes before the DB connections close
+            await view_ingestion.stop()
+            await engagement_counters.stop()
+            await suggest_index.stop()
+            await search_backend.stop()
+            await category_registry.stop()
+            await site_stats.stop()
+            await published_counts.stop()
+            await trending_engine.stop()
+            await hot_tracker.stop()
+            await view_rollup.stop()
+            await token_revocations.stop()
+            await unique_views.stop()
+            password_hasher.shutdown()
 
 app = FastAPI(
     lifespan=lifespan,
     exception_handlers=tortoise_exception_handlers(),
+    default_response_class=FastJSONResponse,
     title=settings.PROJECT_NAME,
     description=settings.PROJECT_DESCRIPTION,
     version=settings.PROJECT_VERSION,
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from typing import Optional
+
+from tortoise import connections
+
+from db.models import Article, Category, Newsletter
+from config import settings
+from shemas.admin_schemas import AdminStatsResponse, ViewDedupStats
+from shemas.article_schemas import ArticleListItem
+from services.category_registry import category_registry
+from services.projection import columns
+from services.serialization import serialize_row
+from services.site_stats import site_stats
+from services.view_dedup import view_dedup
+
+
+# Every status count in one pass over articles
+STATUS_COUNTS_SQL = """
+SELECT
+    count(*) AS total_articles,
+    count(*) FILTER (WHERE status = 'published') AS published_articles,
+    count(*) FILTER (WHERE status = 'draft') AS draft_articles,
+    count(*) FILTER (WHERE status = 'flagged') AS flagged_articles
+FROM articles
+"""
+
+RECENT_ARTICLES_LIMIT = 10
+
+
+class AdminDashboard:
+    """
+    Admin dashboard statistics, cached for ``ttl`` seconds.
+
+    The independent queries run concurrently on the connection pool, and
+    total_views comes from the materialized SiteStats row instead of a COUNT
+    over article_views. Admin article writes invalidate the cache.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._cached: Optional[AdminStatsResponse] = None
+        self._expires_at = 0.0
+
+    def invalidate(self):
+        self._cached = None
+
+    async def get(self) -> AdminStatsResponse:
+        if self._cached is None or self._expires_at <= time.monotonic():
+            self._cached = await self._compute()
+            self._expires_at = time.monotonic() + self.ttl
+        # Live in-memory counters, not part of the cached snapshot
+        return self._cached.model_copy(update={"view_dedup": ViewDedupStats(**view_dedup.stats())})
+
+    async def _compute(self) -> AdminStatsResponse:
+        status_counts, total_categories, newsletter_subscribers, stats, recent = await asyncio.gather(
+            connections.get("default").execute_query_dict(STATUS_COUNTS_SQL),
+            Category.all().count(),
+            Newsletter.filter(is_active=True).count(),
+            site_stats.get(),
+            Article.all().order_by("-created_at").limit(RECENT_ARTICLES_LIMIT).only(*columns(ArticleListItem)),
+        )
+        categories = await category_registry.summaries(article.category_id for article in recent)
+
+        return AdminStatsResponse(
+            **status_counts[0],
+            total_categories=total_categories,
+            newsletter_subscribers=newsletter_subscribers,
+            total_views=stats.total_views,
+            accuracy_rate=stats.accuracy_rate,
+            recent_articles=[serialize_row(ArticleListItem, article, categories) for article in recent],
+            view_dedup=ViewDedupStats(**view_dedup.stats())
+        )
+
+
+admin_dashboard = AdminDashboard(ttl=settings.ADMIN_STATS_TTL_SECONDS)
@@ -0,0 +1,94 @@
+from typing import Optional
+
+from tortoise.transactions import in_transaction
+
+from services.article_hooks import articles_updated, articles_deleted
+from services.category_counts import add_published_counts, published_count_deltas
+
+
+# Columns an article set can be selected by, besides its ids
+FILTER_COLUMNS = ("status", "category_id", "is_featured", "is_breaking_news", "author")
+
+# Columns a batch update can set
+UPDATE_COLUMNS = ("status", "is_featured", "is_breaking_news", "category_id")
+
+# The old row is locked and read in a subquery so RETURNING has the state
+# before and after the write. published_at follows update_article: it is set
+# when an article moves to published from another status. Rows that already
+# have the requested values are left alone.
+UPDATE_SQL = """
+UPDATE articles AS a
+SET {assignments},
+    published_at = CASE WHEN {publishes} THEN now() ELSE a.published_at END,
+    updated_at = now()
+FROM (SELECT id, status, category_id FROM articles WHERE {where} FOR UPDATE) AS old
+WHERE a.id = old.id AND ({columns}) IS DISTINCT FROM ({values})
+RETURNING a.id, old.status AS old_status, old.category_id AS old_category_id, a.status, a.category_id
+"""
+
+DELETE_SQL = """
+DELETE FROM articles WHERE {where}
+RETURNING id, status, category_id
+"""
+
+
+def _where(ids: Optional[list[int]], filters: dict, params: list) -> str:
+    """WHERE clause for an article set, appending its values to ``params``"""
+    conditions = []
+    if ids is not None:
+        params.append(ids)
+        conditions.append(f"id = ANY(${len(params)}::int[])")
+    for column in FILTER_COLUMNS:
+        if filters.get(column) is not None:
+            params.append(filters[column])
+            conditions.append(f"{column} = ${len(params)}")
+    return " AND ".join(conditions)
+
+
+async def update_articles(ids: Optional[list[int]], filters: dict, changes: dict) -> list[int]:
+    """
+    Apply ``changes`` to the articles with the given ids and/or matching
+    ``filters`` in one statement. Returns the ids of the articles that changed.
+    """
+    params: list = []
+    where = _where(ids, filters, params)
+    assignments, columns, values = [], [], []
+    for column in UPDATE_COLUMNS:
+        if changes.get(column) is not None:
+            params.append(changes[column])
+            assignments.append(f"{column} = ${len(params)}")
+            columns.append(f"a.{column}")
+            values.append(f"${len(params)}")
+
+    status = changes.get("status")
+    publishes = "old.status <> 'published'" if status == "published" else "false"
+    sql = UPDATE_SQL.format(
+        assignments=", ".join(assignments),
+        publishes=publishes,
+        where=where,
+        # ROW() so a single column still compares as a row
+        columns=f"ROW({', '.join(columns)})",
+        values=f"ROW({', '.join(values)})",
+    )
+    async with in_transaction() as conn:
+        rows = await conn.execute_query_dict(sql, params)
+        changes = {
+            row["id"]: ((row["old_status"], row["old_category_id"]), (row["status"], row["category_id"]))
+            for row in rows
+        }
+        await add_published_counts(conn, published_count_deltas(changes.values()))
+
+    await articles_updated(changes)
+    return sorted(row["id"] for row in rows)
+
+
+async def delete_articles(ids: Optional[list[int]], filters: dict) -> list[int]:
+    """Delete the articles with the given ids and/or matching ``filters`` in one statement"""
+    params: list = []
+    async with in_transaction() as conn:
+        rows = await conn.execute_query_dict(DELETE_SQL.format(where=_where(ids, filters, params)), params)
+        deleted = {row["id"]: (row["status"], row["category_id"]) for row in rows}
+        await add_published_counts(conn, published_count_deltas((before, None) for before in deleted.values()))
+
+    await articles_deleted(deleted)
+    return sorted(row["id"] for row in rows)
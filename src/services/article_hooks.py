@@ -0,0 +1,78 @@
+from typing import Iterable, Optional
+
+from db.models import Article
+from services.category_counts import published_count_deltas
+from services.count_cache import count_cache
+from services.search import search_backend
+from services.suggest import suggest_index
+from services.site_stats import site_stats, published_delta
+from services.admin_stats import admin_dashboard
+
+
+def article_state(article: Article) -> tuple[str, int]:
+    """The (status, category_id) of an article, as passed to the hooks below"""
+    return (article.status, article.category_id)
+
+
+# Category published counts are not updated here: writers apply them in the
+# transaction of the article write, with category_counts.add_published_counts
+
+
+async def article_saved(article: Article, before: Optional[tuple[str, int]] = None):
+    """Propagate a created or updated article to counters, caches and indexes"""
+    count_cache.invalidate()
+    admin_dashboard.invalidate()
+    await site_stats.add(total_articles=published_delta(before, article_state(article)))
+    await search_backend.index_article(article)
+    suggest_index.index_article(article)
+
+
+async def _add_total_articles(changes: Iterable[tuple[Optional[tuple[str, int]], Optional[tuple[str, int]]]]):
+    """Site counter for many (before, after) article states, in one statement"""
+    await site_stats.add(total_articles=sum(published_count_deltas(changes).values()))
+
+
+async def articles_created(articles: list[Article]):
+    """article_saved for a batch of new articles"""
+    if not articles:
+        return
+    count_cache.invalidate()
+    admin_dashboard.invalidate()
+    await _add_total_articles((None, article_state(article)) for article in articles)
+    await search_backend.index_articles(articles)
+    suggest_index.index_articles(articles)
+
+
+async def articles_updated(changes: dict[int, tuple[tuple[str, int], tuple[str, int]]]):
+    """article_saved for a batch update, given the (before, after) state of each changed article"""
+    if not changes:
+        return
+    count_cache.invalidate()
+    admin_dashboard.invalidate()
+    await _add_total_articles(changes.values())
+    # Indexes only hold status and category, flag changes need no reindex
+    reindex = [article_id for article_id, (before, after) in changes.items() if before != after]
+    if reindex:
+        articles = await Article.filter(id__in=reindex)
+        await search_backend.index_articles(articles)
+        suggest_index.index_articles(articles)
+
+
+async def articles_deleted(deleted: dict[int, tuple[str, int]]):
+    """article_deleted for a batch, given the state of each deleted article"""
+    if not deleted:
+        return
+    count_cache.invalidate()
+    admin_dashboard.invalidate()
+    await _add_total_articles((before, None) for before in deleted.values())
+    await search_backend.remove_articles(list(deleted))
+    suggest_index.remove_articles(list(deleted))
+
+
+async def article_deleted(article_id: int, before: tuple[str, int]):
+    """Propagate a deleted article to counters, caches and indexes"""
+    count_cache.invalidate()
+    admin_dashboard.invalidate()
+    await site_stats.add(total_articles=published_delta(before, None))
+    await search_backend.remove_article(article_id)
+    suggest_index.remove_article(article_id)
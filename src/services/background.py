@@ -0,0 +1,72 @@
+import asyncio
+from typing import Optional
+
+from loguru import logger
+
+
+class BackgroundFlusher:
+    """
+    Base class for services that buffer writes in memory.
+
+    ``flush`` runs every ``flush_interval`` seconds, whenever ``request_flush``
+    is called, and once more on ``stop`` unless ``flush_on_stop`` is False.
+    Subclasses implement ``flush``. An exception from it is logged and the
+    next run happens as scheduled.
+    """
+
+    flush_on_stop = True
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def flush(self):
+        raise NotImplementedError
+
+    def request_flush(self):
+        """Wake the background task so it flushes without waiting for the interval"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @property
+    def flush_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping:
+                break
+            self._wakeup.clear()
+            await self._flush_logged()
+
+    async def _flush_logged(self):
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("{} flush failed", type(self).__name__)
+
+    def start(self):
+        """Start the background task"""
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task and flush whatever is left"""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        if self.flush_on_stop:
+            await self._flush_logged()
@@ -0,0 +1,274 @@
+import math
+import re
+from array import array
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+
+from db.models import Article
+from services.background import BackgroundFlusher
+from services.category_registry import category_registry
+from services.search import SearchBackend, SearchHit, search_result
+
+
+TOKEN_RE = re.compile(r"\w+")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the "
+    "this to was were will with".split()
+)
+
+# Term frequency multipliers, same field order as the weights of the Postgres backend
+FIELD_WEIGHTS = (("title", 4), ("summary", 2), ("content", 1), ("author", 1))
+
+# Article fields an index entry is built from
+ARTICLE_FIELDS = (
+    "id", "title", "slug", "summary", "content", "author", "featured_image", "views_count", "published_at"
+)
+
+MAX_TF = 0xFFFF
+BUILD_BATCH_SIZE = 1000
+
+
+class IndexedCategory(NamedTuple):
+    id: int
+    name: str
+    slug: str
+
+
+class IndexedArticle(NamedTuple):
+    """Fields of a published article needed to render a search result"""
+    id: int
+    title: str
+    slug: str
+    summary: Optional[str]
+    author: str
+    featured_image: Optional[str]
+    views_count: int
+    published_at: Optional[datetime]
+    category: IndexedCategory
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    if not text:
+        return []
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class InMemorySearchBackend(BackgroundFlusher, SearchBackend):
+    """
+    BM25 search over an in-process inverted index of published articles.
+
+    Each term maps to two parallel arrays (article ids, weighted term
+    frequencies). Like the Postgres backend, every query term must match.
+    Article bodies are not kept in memory, snippets come from the summary.
+
+    The index lives in one worker process: it is built at startup, updated by
+    the admin writes that process handles and rebuilt every
+    ``refresh_interval`` seconds, which bounds how long it serves articles
+    that another worker changed or deleted.
+    """
+
+    k1 = 1.2
+    b = 0.75
+    flush_on_stop = False
+
+    def __init__(self, refresh_interval: float):
+        super().__init__(refresh_interval)
+        # Writes made while a build runs, as (removed ids, added rows with their
+        # category); replayed onto the new index before it is swapped in
+        self._writes_during_build: Optional[list[tuple[list[int], list[tuple[dict, dict]]]]] = None
+        self._reset()
+
+    def _reset(self):
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._doc_terms: dict[int, tuple[str, ...]] = {}
+        self._doc_lengths: dict[int, int] = {}
+        self._docs: dict[int, IndexedArticle] = {}
+        self._total_length = 0
+
+    async def flush(self):
+        """Rebuild from the database"""
+        await self.build()
+
+    async def build(self):
+        """
+        Index every published article, in batches to bound memory. Searches
+        use the previous index until the new one is complete; writes made
+        meanwhile go to both, as the batches may have been read before them.
+        """
+        index = InMemorySearchBackend(self.flush_interval)
+        self._writes_during_build = []
+        try:
+            last_id = 0
+            while True:
+                rows = await Article.filter(
+                    status="published",
+                    id__gt=last_id
+                ).order_by("id").limit(BUILD_BATCH_SIZE).values(*ARTICLE_FIELDS, "category_id")
+                if not rows:
+                    break
+                categories = await category_registry.summaries(row["category_id"] for row in rows)
+                for row in rows:
+                    index._add(row, categories[row["category_id"]])
+                last_id = rows[-1]["id"]
+
+            # No await from here to the swap, so no write can slip in between
+            for removed, added in self._writes_during_build:
+                index._remove(removed)
+                for row, category in added:
+                    index._add(row, category)
+        finally:
+            self._writes_during_build = None
+
+        self._postings, self._doc_terms, self._doc_lengths = index._postings, index._doc_terms, index._doc_lengths
+        self._docs, self._total_length = index._docs, index._total_length
+
+    async def index_article(self, article: Article):
+        """Add, replace or drop an article after an admin write"""
+        await self.index_articles([article])
+
+    async def index_articles(self, articles: list[Article]):
+        """index_article for a batch, with one category lookup"""
+        categories = await category_registry.summaries(article.category_id for article in articles)
+        self._write(
+            [article.id for article in articles],
+            [
+                ({field: getattr(article, field) for field in ARTICLE_FIELDS}, categories[article.category_id])
+                for article in articles if article.status == "published"
+            ]
+        )
+
+    async def remove_article(self, article_id: int):
+        self._write([article_id], [])
+
+    async def remove_articles(self, article_ids: list[int]):
+        self._write(article_ids, [])
+
+    def _write(self, removed: list[int], added: list[tuple[dict, dict]]):
+        self._remove(removed)
+        for row, category in added:
+            self._add(row, category)
+        if self._writes_during_build is not None:
+            self._writes_during_build.append((removed, added))
+
+    def _add(self, row: dict, category: dict):
+        frequencies: dict[str, int] = {}
+        for field, weight in FIELD_WEIGHTS:
+            for token in tokenize(row[field]):
+                frequencies[token] = frequencies.get(token, 0) + weight
+
+        article_id = row["id"]
+        for term, tf in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("H"))
+            postings[0].append(article_id)
+            postings[1].append(min(tf, MAX_TF))
+
+        length = sum(frequencies.values())
+        self._doc_terms[article_id] = tuple(frequencies)
+        self._doc_lengths[article_id] = length
+        self._total_length += length
+        self._docs[article_id] = IndexedArticle(
+            id=article_id,
+            title=row["title"],
+            slug=row["slug"],
+            summary=row["summary"],
+            author=row["author"],
+            featured_image=row["featured_image"],
+            views_count=row["views_count"],
+            published_at=row["published_at"],
+            category=IndexedCategory(**category),
+        )
+
+    def _remove(self, article_ids: Iterable[int]):
+        """Drop articles from the index, rewriting each posting list they are in once"""
+        removed: set[int] = set()
+        touched: set[str] = set()
+        for article_id in article_ids:
+            terms = self._doc_terms.pop(article_id, None)
+            if terms is None:
+                continue
+            removed.add(article_id)
+            touched.update(terms)
+            self._total_length -= self._doc_lengths.pop(article_id)
+            del self._docs[article_id]
+
+        for term in touched:
+            ids, frequencies = self._postings[term]
+            kept = [position for position, article_id in enumerate(ids) if article_id not in removed]
+            if kept:
+                self._postings[term] = (array("I", (ids[i] for i in kept)), array("H", (frequencies[i] for i in kept)))
+            else:
+                del self._postings[term]
+
+    def _score(self, q: str, categories: Optional[list[str]]) -> dict[int, float]:
+        """BM25 scores of the articles matching every term of the query"""
+        terms = set(tokenize(q))
+        if not terms or any(term not in self._postings for term in terms):
+            return {}
+
+        doc_count = len(self._docs)
+        average_length = self._total_length / doc_count
+
+        scores: Optional[dict[int, float]] = None
+        # Rarest term first, so the candidate set only shrinks
+        for term in sorted(terms, key=lambda t: len(self._postings[t][0])):
+            ids, frequencies = self._postings[term]
+            idf = math.log(1 + (doc_count - len(ids) + 0.5) / (len(ids) + 0.5))
+
+            matched = {}
+            for article_id, tf in zip(ids, frequencies):
+                if scores is not None and article_id not in scores:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[article_id] / average_length)
+                matched[article_id] = (scores[article_id] if scores is not None else 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+            scores = matched
+
+        if categories:
+            wanted = set(categories)
+            scores = {
+                article_id: score for article_id, score in scores.items()
+                if self._docs[article_id].category.slug in wanted
+            }
+        return scores
+
+    def _snippet(self, article_id: int, q: str) -> Optional[str]:
+        summary = self._docs[article_id].summary
+        if not summary:
+            return None
+        terms = set(tokenize(q))
+        return TOKEN_RE.sub(
+            lambda match: f"<mark>{match.group()}</mark>" if match.group().lower() in terms else match.group(),
+            summary
+        )
+
+    async def search(
+        self,
+        q: str,
+        categories: Optional[list[str]],
+        limit: int,
+        offset: int = 0,
+        after: Optional[list] = None
+    ) -> list[SearchHit]:
+        ranked = sorted(
+            ((score, article_id) for article_id, score in self._score(q, categories).items()),
+            reverse=True
+        )
+        if after:
+            ranked = [item for item in ranked if item < (after[0], after[1])]
+
+        return [
+            SearchHit(article_id, score, self._snippet(article_id, q))
+            for score, article_id in ranked[offset:offset + limit]
+        ]
+
+    async def count(self, q: str, categories: Optional[list[str]]) -> int:
+        return len(self._score(q, categories))
+
+    async def results(self, hits: list[SearchHit], fields: Optional[list[str]] = None) -> list[dict]:
+        """Rendered from the index, without a database query"""
+        return [
+            search_result(self._docs[hit.id], self._docs[hit.id].category._asdict(), hit, fields)
+            for hit in hits if hit.id in self._docs
+        ]
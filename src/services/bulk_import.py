@@ -0,0 +1,255 @@
+import codecs
+import csv
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+from typing import AsyncIterator, Optional, Union
+
+import orjson
+import slugify
+from loguru import logger
+from pydantic import ValidationError
+from tortoise.transactions import in_transaction
+
+from db.models import Article
+from shemas.article_schemas import ArticleCreate
+from services.article_hooks import articles_created
+from services.category_counts import add_published_counts
+from services.category_registry import category_registry
+
+
+# Slugs taken by a conflicting insert (e.g. a concurrent import) are skipped
+INSERT_ARTICLES_SQL = """
+INSERT INTO articles (
+    title, slug, content, summary, author, status, meta_description, featured_image,
+    is_featured, is_breaking_news, published_at, category_id,
+    views_count, likes_count, dislikes_count, shares_count, is_trending, created_at, updated_at
+)
+SELECT
+    r.title, r.slug, r.content, r.summary, r.author, r.status, r.meta_description, r.featured_image,
+    r.is_featured, r.is_breaking_news, r.published_at, r.category_id,
+    0, 0, 0, 0, false, now(), now()
+FROM unnest(
+    $1::varchar[], $2::varchar[], $3::text[], $4::text[], $5::varchar[], $6::varchar[], $7::varchar[], $8::varchar[],
+    $9::bool[], $10::bool[], $11::timestamptz[], $12::int[]
+) AS r(
+    title, slug, content, summary, author, status, meta_description, featured_image,
+    is_featured, is_breaking_news, published_at, category_id
+)
+ON CONFLICT (slug) DO NOTHING
+RETURNING id, slug, created_at, updated_at
+"""
+
+INSERT_COLUMNS = (
+    "title", "slug", "content", "summary", "author", "status", "meta_description", "featured_image",
+    "is_featured", "is_breaking_news", "published_at", "category_id",
+)
+
+# varchar limits of the inserted columns, checked per row so one long value
+# fails its row instead of the batch insert
+COLUMN_LENGTHS = {
+    column: Article._meta.fields_map[column].max_length
+    for column in INSERT_COLUMNS
+    if getattr(Article._meta.fields_map.get(column), "max_length", None)
+}
+
+# A parsed row: its 1-based number and the field dict, or why it could not be parsed
+ParsedRow = tuple[int, Union[dict, str]]
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """UTF-8 lines of a chunked body, without their line endings"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """One JSON object per line, blank lines are skipped"""
+    number = 0
+    async for line in _lines(chunks):
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = orjson.loads(line)
+        except orjson.JSONDecodeError as exc:
+            yield number, f"Invalid JSON: {exc}"
+            continue
+        yield number, row if isinstance(row, dict) else "Expected a JSON object"
+
+
+async def csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    """CSV with a header row of ArticleCreate field names; empty cells are left unset"""
+    header = None
+    number = 0
+    record = ""
+    async for line in _lines(chunks):
+        # A quoted field may span lines, a record is complete once its quotes balance
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        number += 1
+        if len(values) != len(header):
+            yield number, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield number, {name: value for name, value in zip(header, values) if value != ""}
+
+    if record:
+        number += 1
+        yield number, "Unterminated quoted field"
+
+
+def _generated_slug(title: str) -> str:
+    return slugify.slugify(title, max_length=COLUMN_LENGTHS["slug"])
+
+
+def _unique_slug(slug: str, suffix: str) -> str:
+    """``slug`` with ``suffix`` appended, shortened so the result still fits the column"""
+    return slug[:COLUMN_LENGTHS["slug"] - len(suffix)].rstrip("-") + suffix
+
+
+def _length_error(values: dict) -> Optional[str]:
+    return "; ".join(
+        f"{column}: String should have at most {limit} characters"
+        for column, limit in COLUMN_LENGTHS.items()
+        if values[column] is not None and len(values[column]) > limit
+    ) or None
+
+
+def _validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    )
+
+
+class BulkImport:
+    """
+    Imports articles from parsed rows in batches of ``batch_size``.
+
+    Each batch is validated with ArticleCreate, resolves its categories from
+    the registry and checks all its slugs in one query, then inserts in one
+    multi-row statement inside a transaction. Counters, caches and search
+    indexes are updated once per batch. Slug rules follow create_article: a
+    given slug must be unused, a generated one gets a suffix when taken.
+    Values too long for their column fail their row. A batch whose insert
+    fails has all its rows reported as failed; earlier batches stay imported.
+    """
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self.results: list[dict] = []
+        self.created = 0
+
+    async def run(self, rows: AsyncIterator[ParsedRow]) -> dict:
+        batch: list[ParsedRow] = []
+        async for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                await self._import_batch(batch)
+                batch = []
+        if batch:
+            await self._import_batch(batch)
+
+        return dict(
+            total=len(self.results),
+            created=self.created,
+            failed=len(self.results) - self.created,
+            results=sorted(self.results, key=lambda result: result["row"]),
+        )
+
+    def _fail(self, number: int, error: str):
+        self.results.append({"row": number, "error": error})
+
+    async def _import_batch(self, batch: list[ParsedRow]):
+        valid: list[tuple[int, ArticleCreate]] = []
+        for number, row in batch:
+            if isinstance(row, str):
+                self._fail(number, row)
+                continue
+            try:
+                valid.append((number, ArticleCreate.model_validate(row)))
+            except ValidationError as exc:
+                self._fail(number, _validation_error(exc))
+
+        categories = await category_registry.summaries(article.category_id for _, article in valid)
+        candidates = {article.slug or _generated_slug(article.title) for _, article in valid}
+        # Too long to exist, and Tortoise rejects them as lookup values; their rows fail below
+        candidates = {slug for slug in candidates if len(slug) <= COLUMN_LENGTHS["slug"]}
+        taken = set(await Article.filter(slug__in=candidates).values_list("slug", flat=True))
+
+        now = datetime.now(dt_timezone.utc)
+        pending: list[tuple[int, dict]] = []
+        for number, article in valid:
+            if article.category_id not in categories:
+                self._fail(number, "Category not found")
+                continue
+            if article.slug:
+                slug = article.slug
+                if slug in taken:
+                    self._fail(number, "Slug already exists")
+                    continue
+            else:
+                slug = _generated_slug(article.title)
+                if slug in taken:
+                    slug = _unique_slug(slug, f"-{now.timestamp()}-{number}")
+            values = article.model_dump(exclude={"slug"})
+            values.update(slug=slug, published_at=now if article.status == "published" else None)
+            error = _length_error(values)
+            if error:
+                self._fail(number, error)
+                continue
+            taken.add(slug)
+            pending.append((number, values))
+
+        if not pending:
+            return
+
+        try:
+            async with in_transaction() as conn:
+                inserted = await conn.execute_query_dict(
+                    INSERT_ARTICLES_SQL,
+                    [[values[column] for _, values in pending] for column in INSERT_COLUMNS],
+                )
+                slugs = {row["slug"] for row in inserted}
+                await add_published_counts(conn, Counter(
+                    values["category_id"] for _, values in pending
+                    if values["slug"] in slugs and values["status"] == "published"
+                ))
+        except Exception as exc:
+            # Earlier batches are committed, report this one and go on with the next
+            logger.exception("Failed to import a batch of {} articles", len(pending))
+            for number, _ in pending:
+                self._fail(number, f"Insert failed: {exc}")
+            return
+        inserted_by_slug = {row["slug"]: row for row in inserted}
+
+        articles = []
+        for number, values in pending:
+            row = inserted_by_slug.get(values["slug"])
+            if row is None:
+                self._fail(number, "Slug already exists")
+                continue
+            self.results.append({"row": number, "id": row["id"], "slug": values["slug"]})
+            articles.append(Article(
+                id=row["id"], created_at=row["created_at"], updated_at=row["updated_at"],
+                **{column: values[column] for column in INSERT_COLUMNS}
+            ))
+        self.created += len(articles)
+
+        await articles_created(articles)
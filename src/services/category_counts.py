@@ -0,0 +1,94 @@
+from collections import Counter
+from typing import Iterable, Optional
+
+from tortoise.transactions import in_transaction
+
+from config import settings
+from services.background import BackgroundFlusher
+
+
+REFRESH_COUNTS_SQL = """
+UPDATE categories AS c
+SET published_article_count = coalesce(counts.total, 0)
+FROM categories AS current
+LEFT JOIN (
+    SELECT category_id, count(*) AS total
+    FROM articles
+    WHERE status = 'published'
+    GROUP BY category_id
+) AS counts ON counts.category_id = current.id
+WHERE c.id = current.id
+    AND c.published_article_count IS DISTINCT FROM coalesce(counts.total, 0)
+"""
+
+
+# Category rows a delta or recount is about to update, locked in id order so
+# writers touching several categories cannot deadlock with each other
+LOCK_CATEGORIES_SQL = "SELECT id FROM categories WHERE id = ANY($1::int[]) ORDER BY id FOR NO KEY UPDATE"
+
+LOCK_ALL_CATEGORIES_SQL = "SELECT id FROM categories ORDER BY id FOR NO KEY UPDATE"
+
+ADD_COUNTS_SQL = """
+UPDATE categories AS c
+SET published_article_count = c.published_article_count + d.delta
+FROM unnest($1::int[], $2::int[]) AS d(category_id, delta)
+WHERE c.id = d.category_id
+"""
+
+
+async def refresh_published_counts():
+    """
+    Recompute every Category.published_article_count in a single statement.
+
+    The category rows are locked first. An article write applies its delta
+    in its own transaction, under the same row lock, so the recount either
+    sees that write committed or the write adds its delta after the recount.
+    """
+    async with in_transaction() as conn:
+        await conn.execute_query(LOCK_ALL_CATEGORIES_SQL)
+        await conn.execute_query(REFRESH_COUNTS_SQL)
+
+
+def published_count_deltas(changes: Iterable[tuple[Optional[tuple[str, int]], Optional[tuple[str, int]]]]) -> Counter[int]:
+    """
+    Change in published articles per category for article writes.
+
+    ``changes`` are the (before, after) (status, category_id) of each article
+    around the write, None when it was created or deleted.
+    """
+    deltas: Counter[int] = Counter()
+    for before, after in changes:
+        if before and before[0] == "published":
+            deltas[before[1]] -= 1
+        if after and after[0] == "published":
+            deltas[after[1]] += 1
+    return deltas
+
+
+async def add_published_counts(conn, deltas: dict[int, int]):
+    """Apply published article count changes inside the transaction of the article write"""
+    deltas = {category_id: deltas[category_id] for category_id in sorted(deltas) if deltas[category_id]}
+    if deltas:
+        await conn.execute_query(LOCK_CATEGORIES_SQL, [list(deltas)])
+        await conn.execute_query(ADD_COUNTS_SQL, [list(deltas), list(deltas.values())])
+
+
+async def track_article_change(conn, before: Optional[tuple[str, int]], after: Optional[tuple[str, int]]):
+    """add_published_counts for a single article write, states as in published_count_deltas"""
+    await add_published_counts(conn, published_count_deltas([(before, after)]))
+
+
+class PublishedCountsRefresher(BackgroundFlusher):
+    """
+    Recounts published_article_count from the articles table every
+    ``flush_interval`` seconds, correcting any drift left by writes made
+    outside this API.
+    """
+
+    flush_on_stop = False
+
+    async def flush(self):
+        await refresh_published_counts()
+
+
+published_counts = PublishedCountsRefresher(settings.CATEGORY_COUNTS_REFRESH_SECONDS)
@@ -0,0 +1,88 @@
+from typing import Iterable, Optional
+
+from tortoise.signals import post_delete, post_save
+
+from db.models import Category
+from config import settings
+from services.background import BackgroundFlusher
+
+
+class CategoryRegistry(BackgroundFlusher):
+    """
+    Process-wide map of categories by id and slug.
+
+    Categories are a handful of rarely changing rows, so list endpoints
+    resolve category slugs and render category summaries from here instead
+    of joining or prefetching the categories table.
+
+    Saving or deleting a Category in this process invalidates the registry,
+    an article pointing at an unknown category id reloads it, and a periodic
+    reload every ``flush_interval`` seconds picks up other processes' changes.
+    The cached instances' published_article_count is not kept current.
+    """
+
+    flush_on_stop = False
+
+    def __init__(self, refresh_interval: float):
+        super().__init__(refresh_interval)
+        self._by_id: dict[int, Category] = {}
+        self._by_slug: dict[str, Category] = {}
+        self._summaries: dict[int, dict] = {}
+        self._stale = True
+
+    async def flush(self):
+        """Reload from the database"""
+        await self.load()
+
+    async def load(self):
+        categories = await Category.all()
+        self._by_id = {category.id: category for category in categories}
+        self._by_slug = {category.slug: category for category in categories}
+        self._summaries = {
+            category.id: {"id": category.id, "name": category.name, "slug": category.slug}
+            for category in categories
+        }
+        self._stale = False
+
+    def invalidate(self):
+        """Reload on the next lookup"""
+        self._stale = True
+
+    async def _ensure(self, category_ids: Iterable[int] = ()):
+        if self._stale or any(category_id not in self._by_id for category_id in category_ids):
+            await self.load()
+
+    async def get(self, category_id: int) -> Optional[Category]:
+        await self._ensure([category_id])
+        return self._by_id.get(category_id)
+
+    async def get_by_slug(self, slug: str) -> Optional[Category]:
+        await self._ensure()
+        return self._by_slug.get(slug)
+
+    async def ids_for_slugs(self, slugs: Iterable[str]) -> list[int]:
+        """Ids of the known categories among ``slugs``, for ``category_id__in`` filters"""
+        await self._ensure()
+        return [self._by_slug[slug].id for slug in slugs if slug in self._by_slug]
+
+    async def summaries(self, category_ids: Iterable[int]) -> dict[int, dict]:
+        """CategorySummary fields by category id"""
+        category_ids = set(category_ids)
+        await self._ensure(category_ids)
+        return self._summaries
+
+    async def summary(self, category_id: int) -> dict:
+        return (await self.summaries([category_id]))[category_id]
+
+
+category_registry = CategoryRegistry(settings.CATEGORY_REFRESH_SECONDS)
+
+
+@post_save(Category)
+async def _category_saved(sender, instance, created, using_db, update_fields):
+    category_registry.invalidate()
+
+
+@post_delete(Category)
+async def _category_deleted(sender, instance, using_db):
+    category_registry.invalidate()
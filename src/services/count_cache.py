@@ -0,0 +1,97 @@
+import json
+import time
+from typing import Awaitable, Callable, Optional
+
+from tortoise import connections
+from tortoise.queryset import QuerySet
+
+from config import settings
+
+
+class CountCache:
+    """
+    TTL cache for paginated list totals.
+
+    Entries are keyed by the normalized filter set, so every page of the same
+    listing shares one COUNT. Admin article writes clear the cache; the TTL
+    bounds staleness for writes made by other worker processes.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, estimate_threshold: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.estimate_threshold = estimate_threshold
+        self._entries: dict[tuple, tuple[float, int]] = {}
+
+    @staticmethod
+    def make_key(
+        scope: str,
+        status: Optional[str] = None,
+        categories: Optional[list[str]] = None,
+        search: Optional[str] = None
+    ) -> tuple:
+        """Normalize a filter set so equivalent requests share a cache entry"""
+        return (
+            scope,
+            status,
+            tuple(sorted(set(categories or []))),
+            search.strip().lower() if search else None,
+        )
+
+    async def count(self, query: QuerySet, key: tuple, total_mode: str = "exact") -> int:
+        """Total for a filtered query, exact (cached) or a planner estimate"""
+        return await self.resolve(key, query.count, lambda: estimate_count(query), total_mode)
+
+    async def resolve(
+        self,
+        key: tuple,
+        exact: Callable[[], Awaitable[int]],
+        estimate: Callable[[], Awaitable[int]],
+        total_mode: str = "exact"
+    ) -> int:
+        """Total from the ``exact`` or ``estimate`` counter, exact results are cached"""
+        if total_mode == "estimate":
+            estimated = await estimate()
+            # Estimates are only worth their error on large result sets
+            if estimated >= self.estimate_threshold:
+                return estimated
+
+        cached = self._entries.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        total = await exact()
+
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, total)
+        return total
+
+    def invalidate(self):
+        """Drop every cached total, called after article writes"""
+        self._entries.clear()
+
+
+def _plan_rows(rows) -> int:
+    plan = rows[0]["QUERY PLAN"]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def estimate_count(query: QuerySet) -> int:
+    """Row estimate of the PostgreSQL planner for a query, without running it"""
+    return _plan_rows(await query.explain())
+
+
+async def estimate_sql_count(sql: str, params: list) -> int:
+    """Row estimate of the PostgreSQL planner for a raw SELECT, without running it"""
+    _, rows = await connections.get("default").execute_query(f"EXPLAIN (FORMAT JSON) {sql}", params)
+    return _plan_rows(rows)
+
+
+count_cache = CountCache(
+    ttl=settings.COUNT_CACHE_TTL_SECONDS,
+    max_entries=settings.COUNT_CACHE_MAX_ENTRIES,
+    estimate_threshold=settings.COUNT_ESTIMATE_THRESHOLD,
+)
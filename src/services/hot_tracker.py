@@ -0,0 +1,180 @@
+import heapq
+import time
+from collections import deque
+from datetime import datetime, timezone as dt_timezone
+
+from tortoise import connections
+from tortoise.transactions import in_transaction
+
+from config import settings
+from services.background import BackgroundFlusher
+
+
+# Sliding windows served by /api/trending?window=..., in seconds
+HOT_WINDOWS = {"5m": 300, "1h": 3600}
+
+# Adds the views counted since the worker's previous snapshot, so the rows
+# sum the counts of every worker. Rows come sorted by (bucket_start,
+# article_id) so workers snapshotting together lock them in the same order.
+SNAPSHOT_SQL = """
+INSERT INTO hot_view_buckets (bucket_start, article_id, views, error)
+SELECT * FROM unnest($1::timestamptz[], $2::int[], $3::int[], $4::int[])
+ON CONFLICT (bucket_start, article_id) DO UPDATE
+SET views = hot_view_buckets.views + excluded.views, error = hot_view_buckets.error + excluded.error
+"""
+
+PRUNE_SNAPSHOT_SQL = "DELETE FROM hot_view_buckets WHERE bucket_start < $1"
+
+RESTORE_SQL = """
+SELECT bucket_start, article_id, views, error FROM hot_view_buckets
+WHERE bucket_start >= $1
+ORDER BY bucket_start, views DESC
+"""
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters summary holding at most ``capacity`` counters.
+
+    When a new item arrives at capacity it replaces the smallest counter and
+    inherits its count as ``error``, so a count overestimates the true one
+    by at most ``error`` (itself at most total / capacity). Any item seen
+    more than total / capacity times is guaranteed to be kept.
+
+    The minimum is found with a heap whose entries may lag behind the
+    counts, they are corrected lazily when they reach the top.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: dict[int, int] = {}
+        self.errors: dict[int, int] = {}
+        self._heap: list[tuple[int, int]] = []
+
+    def add(self, item: int, count: int = 1, error: int = 0):
+        if item in self.counts:
+            self.counts[item] += count
+            return
+
+        if len(self.counts) >= self.capacity:
+            while True:
+                smallest, evicted = self._heap[0]
+                if self.counts[evicted] == smallest:
+                    break
+                heapq.heapreplace(self._heap, (self.counts[evicted], evicted))
+            heapq.heappop(self._heap)
+            del self.counts[evicted]
+            del self.errors[evicted]
+            count, error = smallest + count, smallest + error
+
+        self.counts[item] = count
+        self.errors[item] = error
+        heapq.heappush(self._heap, (count, item))
+
+
+class HotTracker(BackgroundFlusher):
+    """
+    Real-time "hot right now" ranking from the article view stream.
+
+    Views go into one Space-Saving summary per ``bucket_seconds`` time
+    bucket. A window ranking merges the summaries of the buckets it covers,
+    so memory is bounded by ``capacity`` counters per bucket no matter how
+    many articles get views. Rankings are cached for ``cache_seconds``.
+
+    Each worker process tracks the views it serves. Every ``flush_interval``
+    seconds it adds the counts that grew since its previous snapshot to
+    hot_view_buckets, so the table holds the counts of all workers, and at
+    startup a worker restores those totals.
+    """
+
+    def __init__(self, capacity: int, bucket_seconds: int, snapshot_interval: float, cache_seconds: float = 1.0):
+        super().__init__(snapshot_interval)
+        self.capacity = capacity
+        self.bucket_seconds = bucket_seconds
+        self.cache_seconds = cache_seconds
+        self.max_window = max(HOT_WINDOWS.values())
+        self._buckets: deque[tuple[int, SpaceSaving]] = deque()
+        self._rankings: dict[str, tuple[float, list[tuple[int, int]]]] = {}
+        # (views, error) per article already in hot_view_buckets, by bucket start
+        self._snapshotted: dict[int, dict[int, tuple[int, int]]] = {}
+
+    def _bucket(self, bucket_start: int) -> SpaceSaving:
+        if not self._buckets or self._buckets[-1][0] < bucket_start:
+            self._buckets.append((bucket_start, SpaceSaving(self.capacity)))
+            while self._buckets[0][0] <= bucket_start - self.max_window:
+                self._buckets.popleft()
+        return self._buckets[-1][1]
+
+    def record(self, article_id: int):
+        """Count one view"""
+        now = int(time.time())
+        self._bucket(now - now % self.bucket_seconds).add(article_id)
+
+    def top(self, window: str, limit: int) -> list[tuple[int, int]]:
+        """(article id, estimated views) of the ``limit`` most viewed articles in a window"""
+        cached = self._rankings.get(window)
+        if cached is None or cached[0] <= time.monotonic():
+            cached = (time.monotonic() + self.cache_seconds, self._merge(HOT_WINDOWS[window]))
+            self._rankings[window] = cached
+        return cached[1][:limit]
+
+    def _merge(self, window_seconds: int) -> list[tuple[int, int]]:
+        # Whole buckets only, the window is rounded up to the bucket size
+        since = time.time() - window_seconds - self.bucket_seconds
+        totals: dict[int, int] = {}
+        for bucket_start, summary in self._buckets:
+            if bucket_start > since:
+                for article_id, count in summary.counts.items():
+                    totals[article_id] = totals.get(article_id, 0) + count
+        return heapq.nlargest(settings.TRENDING_RANKING_SIZE, totals.items(), key=lambda item: item[1])
+
+    async def flush(self):
+        """Add the counts that grew since the last snapshot to the database"""
+        rows = []
+        snapshotted = {}
+        for bucket_start, summary in self._buckets:
+            previous = self._snapshotted.get(bucket_start, {})
+            current = snapshotted[bucket_start] = {}
+            for article_id, count in summary.counts.items():
+                error = summary.errors[article_id]
+                # An article evicted and counted again restarts from the summary's
+                # minimum, which is never below the count it was evicted with
+                views_before, error_before = previous.get(article_id, (0, 0))
+                if count > views_before:
+                    rows.append((
+                        datetime.fromtimestamp(bucket_start, dt_timezone.utc), article_id,
+                        count - views_before, max(error - error_before, 0)
+                    ))
+                current[article_id] = (count, error)
+
+        cutoff = datetime.fromtimestamp(time.time() - self.max_window - self.bucket_seconds, dt_timezone.utc)
+        async with in_transaction() as conn:
+            await conn.execute_query(PRUNE_SNAPSHOT_SQL, [cutoff])
+            if rows:
+                rows.sort(key=lambda row: row[:2])
+                await conn.execute_query(SNAPSHOT_SQL, [list(column) for column in zip(*rows)])
+        self._snapshotted = snapshotted
+
+    async def restore(self):
+        """Reload the snapshotted buckets that are still inside the largest window"""
+        cutoff = datetime.fromtimestamp(time.time() - self.max_window, dt_timezone.utc)
+        rows = await connections.get("default").execute_query_dict(RESTORE_SQL, [cutoff])
+        self._buckets.clear()
+        self._rankings.clear()
+        self._snapshotted.clear()
+        for row in rows:
+            bucket_start = int(row["bucket_start"].timestamp())
+            summary = self._bucket(bucket_start)
+            summary.add(row["article_id"], row["views"], row["error"])
+            # Already in the table, only growth past these counts is added on snapshot
+            if row["article_id"] in summary.counts:
+                self._snapshotted.setdefault(bucket_start, {})[row["article_id"]] = (
+                    summary.counts[row["article_id"]], summary.errors[row["article_id"]]
+                )
+
+
+hot_tracker = HotTracker(
+    capacity=settings.HOT_TRACKER_CAPACITY,
+    bucket_seconds=settings.HOT_TRACKER_BUCKET_SECONDS,
+    snapshot_interval=settings.HOT_TRACKER_SNAPSHOT_SECONDS,
+)
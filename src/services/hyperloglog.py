@@ -0,0 +1,94 @@
+import math
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Iterable, Optional
+
+
+# 2 ** -rank for every possible register value
+_INVERSE_POWERS = [2.0 ** -rank for rank in range(65)]
+
+
+@lru_cache(maxsize=None)
+def _masks(size: int) -> tuple[int, int]:
+    return int.from_bytes(b"\x80" * size, "big"), (1 << (8 * size)) - 1
+
+
+def _bytewise_max(a: bytes, b: bytes) -> bytes:
+    """
+    Per-byte maximum of two equal-length byte strings whose bytes are below
+    128, computed on whole big integers instead of byte by byte
+    """
+    high, full = _masks(len(a))
+    x, y = int.from_bytes(a, "big"), int.from_bytes(b, "big")
+    # A byte of (x | 0x80) - y keeps its high bit exactly where x >= y
+    x_wins = ((((x | high) - y) & high) >> 7) * 0xFF
+    return ((x & x_wins) | (y & (x_wins ^ full))).to_bytes(len(a), "big")
+
+
+def hash64(value: str) -> int:
+    """Stable 64-bit hash (Python's hash() is salted per process)"""
+    return int.from_bytes(blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """
+    Cardinality estimate over a fixed-size sketch.
+
+    ``2 ** precision`` one-byte registers keep the longest run of leading
+    zero bits seen among the hashes routed to them. The relative standard
+    error of ``count`` is ``1.04 / sqrt(2 ** precision)``: 1.6% at the
+    default precision of 12 (4 KiB), so about 95% of estimates are within
+    3.3% of the exact count. Small counts use linear counting and are
+    nearly exact.
+
+    Sketches of the same precision merge losslessly by taking the register
+    wise maximum, so per-day sketches combine into any window of days.
+    """
+
+    def __init__(self, precision: int = 12, registers: Optional[bytes] = None):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError(f"Expected {self.size} registers, got {len(self.registers)}")
+
+    @staticmethod
+    def relative_error(precision: int) -> float:
+        """Relative standard error of count() at a precision"""
+        return 1.04 / math.sqrt(1 << precision)
+
+    def add(self, value: str):
+        self.add_hash(hash64(value))
+
+    def add_hash(self, hashed: int):
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = 64 - self.precision - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        """Add every value counted by another sketch of the same precision"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        self.registers = bytearray(_bytewise_max(self.registers, other.registers))
+
+    @classmethod
+    def union(cls, sketches: Iterable["HyperLogLog"], precision: int = 12) -> "HyperLogLog":
+        merged = cls(precision)
+        for sketch in sketches:
+            merged.merge(sketch)
+        return merged
+
+    def count(self) -> int:
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(map(_INVERSE_POWERS.__getitem__, self.registers))
+        if estimate <= 2.5 * size:
+            zeros = self.registers.count(0)
+            if zeros:
+                estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
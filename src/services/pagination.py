@@ -0,0 +1,96 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from tortoise.queryset import Q, QuerySet
+
+
+# Sort key columns per supported sort, (field, descending). The primary key is
+# always appended as a tie-breaker so that every position in the order is unique.
+SORT_KEYS = {
+    "created_at": [("created_at", True), ("id", True)],
+    "views_count": [("views_count", True), ("id", True)],
+    "title": [("title", False), ("id", False)],
+    "featured": [("is_featured", True), ("created_at", True), ("id", True)],
+    # Full-text search relevance, only used by search cursors
+    "rank": [("rank", True), ("id", True)],
+}
+
+FIELD_TYPES = {
+    "created_at": datetime,
+    "views_count": int,
+    "title": str,
+    "is_featured": bool,
+    "rank": float,
+    "id": int,
+}
+
+
+def order_by_sort(query: QuerySet, sort: str) -> QuerySet:
+    """Apply the ordering of a supported sort to a query"""
+    return query.order_by(*[
+        f"-{field}" if descending else field
+        for field, descending in SORT_KEYS[sort]
+    ])
+
+
+def sort_columns(sort: str) -> list[str]:
+    """Columns a result row must carry to build a cursor for this sort"""
+    return [field for field, _ in SORT_KEYS[sort]]
+
+
+def encode_cursor(article, sort: str) -> str:
+    """Build an opaque cursor pointing just after the given article"""
+    values = []
+    for field, _ in SORT_KEYS[sort]:
+        value = getattr(article, field)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+
+    payload = json.dumps({"s": sort, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> list:
+    """Decode a cursor into sort key values, raises 400 if it is malformed or for another sort"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        keys = SORT_KEYS[sort]
+        if payload["s"] != sort or len(payload["v"]) != len(keys):
+            raise ValueError("cursor does not match sort")
+
+        values = []
+        for (field, _), value in zip(keys, payload["v"]):
+            if FIELD_TYPES[field] is datetime:
+                value = datetime.fromisoformat(value)
+            elif type(value) is not FIELD_TYPES[field]:
+                raise TypeError(f"invalid value for {field}")
+            values.append(value)
+        return values
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_cursor(query: QuerySet, sort: str, cursor: str) -> QuerySet:
+    """Seek past the cursor position with a WHERE clause instead of OFFSET"""
+    keys = SORT_KEYS[sort]
+    values = decode_cursor(cursor, sort)
+
+    # (a, b, id) after (x, y, z) expands to
+    # a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z)
+    seek = Q()
+    for i, (field, descending) in enumerate(keys):
+        conditions = {prev_field: values[j] for j, (prev_field, _) in enumerate(keys[:i])}
+        conditions[f"{field}__{'lt' if descending else 'gt'}"] = values[i]
+        seek |= Q(**conditions)
+
+    return query.filter(seek)
+
+
+def next_cursor(articles: list, sort: str, limit: int) -> Optional[str]:
+    """Cursor for the page after ``articles``, or None when this is the last page"""
+    if len(articles) < limit:
+        return None
+    return encode_cursor(articles[-1], sort)
@@ -0,0 +1,81 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from db.models import pwd_context
+from config import settings
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing and verification off the event loop.
+
+    bcrypt releases the GIL, so a small thread pool runs ``workers`` hashes
+    in parallel while the loop keeps serving other requests. At most
+    ``max_queue`` calls wait for a worker, each for up to ``queue_timeout``
+    seconds; beyond that callers get a 503 instead of piling up behind a
+    signin storm.
+
+    ``verify`` also returns a new hash when the stored one uses outdated
+    parameters (e.g. fewer bcrypt rounds than configured), for rehash on login.
+    """
+
+    def __init__(self, context: CryptContext, workers: int, max_queue: int, queue_timeout: float):
+        self.context = context
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+
+    def _busy(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    async def _run(self, func, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            self._slots = asyncio.Semaphore(self.workers)
+
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            raise self._busy()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._busy()
+        finally:
+            self._waiting -= 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+        """Whether the password matches, and the replacement hash if the stored one needs an update"""
+        return await self._run(self.context.verify_and_update, password, password_hash)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+
+password_hasher = PasswordHasher(
+    context=pwd_context,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from tortoise.signals import post_delete, post_save
+
+from db.models import Admin, User
+from config import settings
+
+
+class Principal(NamedTuple):
+    user: User
+    admin: Optional[Admin]  # with ``admin.user`` set
+
+
+class PrincipalCache:
+    """
+    TTL + LRU cache of authenticated users and their admin profile, by user id.
+
+    A hit authenticates a request without touching the database. Saving or
+    deleting a User or Admin in this process invalidates its entry (profile
+    updates, deactivation, role and permission changes); the TTL bounds how
+    long other processes, and bulk ``.update()`` calls that fire no signals,
+    can be served a stale principal. Inactive and unknown users are not cached.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[float, Principal]] = OrderedDict()
+
+    async def get(self, user_id: int) -> Optional[Principal]:
+        """The active user and admin profile of ``user_id``, None if there is no active user"""
+        cached = self._entries.get(user_id)
+        if cached and cached[0] > time.monotonic():
+            self._entries.move_to_end(user_id)
+            return cached[1]
+
+        user, admin = await asyncio.gather(
+            User.get_or_none(id=user_id, is_active=True),
+            Admin.get_or_none(user_id=user_id),
+        )
+        if user is None:
+            self._entries.pop(user_id, None)
+            return None
+        if admin is not None:
+            admin.user = user
+
+        principal = Principal(user, admin)
+        self._entries[user_id] = (time.monotonic() + self.ttl, principal)
+        self._entries.move_to_end(user_id)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return principal
+
+    def invalidate(self, user_id: int):
+        self._entries.pop(user_id, None)
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+)
+
+
+@post_save(User)
+async def _user_saved(sender, instance, created, using_db, update_fields):
+    principal_cache.invalidate(instance.id)
+
+
+@post_delete(User)
+async def _user_deleted(sender, instance, using_db):
+    principal_cache.invalidate(instance.id)
+
+
+@post_save(Admin)
+async def _admin_saved(sender, instance, created, using_db, update_fields):
+    principal_cache.invalidate(instance.user_id)
+
+
+@post_delete(Admin)
+async def _admin_deleted(sender, instance, using_db):
+    principal_cache.invalidate(instance.user_id)
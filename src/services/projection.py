@@ -0,0 +1,45 @@
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from db.models import Article
+
+
+# Response fields rendered from a differently named Article column
+COLUMN_ALIASES = {"category": "category_id"}
+
+# Always selected: the primary key, and the category id the category registry
+# renders CategorySummary from
+BASE_COLUMNS = ("id", "category_id")
+
+
+def parse_fields(fields: Optional[str], schema: type[BaseModel]) -> Optional[list[str]]:
+    """
+    Validate a comma-separated ``?fields=`` sparse fieldset against a response
+    schema. Returns None when no fieldset was given; ``id`` is always included.
+    """
+    if not fields:
+        return None
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in schema.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(["id", *requested]))
+
+
+def columns(schema: type[BaseModel], fields: Optional[list[str]] = None, extra: Iterable[str] = ()) -> list[str]:
+    """
+    Article columns to select (with ``QuerySet.only``) for rendering ``fields``
+    of a response schema, all of its fields by default. ``extra`` adds columns
+    needed elsewhere, such as sort keys for the next cursor.
+    """
+    available = Article._meta.fields_db_projection
+    names = [*BASE_COLUMNS, *(fields or schema.model_fields), *extra]
+    selected = (COLUMN_ALIASES.get(name, name) for name in names)
+    return list(dict.fromkeys(
+        column for column in selected
+        if column in available or column in BASE_COLUMNS
+    ))
+
@@ -0,0 +1,194 @@
+from typing import NamedTuple, Optional
+
+from pypika_tortoise.terms import Term, ValueWrapper
+from pypika_tortoise.utils import format_alias_sql
+from tortoise import connections
+
+from config import settings
+from db.models import Article
+from db.schema import SEARCH_CONFIG
+from shemas.common_schemas import SearchResultItem
+from services.count_cache import estimate_sql_count
+from services.category_registry import category_registry
+from services.projection import columns
+from services.serialization import field_names
+
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+class SearchHit(NamedTuple):
+    id: int
+    rank: float
+    snippet: Optional[str]
+
+
+class TextSearchMatch(Term):
+    """``search_vector @@ websearch_to_tsquery(...)`` as a filterable ORM annotation"""
+
+    def __init__(self, query: str):
+        super().__init__()
+        self.query = ValueWrapper(query)
+
+    def get_sql(self, ctx) -> str:
+        sql = f"search_vector @@ websearch_to_tsquery('{SEARCH_CONFIG}', {self.query.get_sql(ctx)})"
+        if ctx.with_alias:
+            return format_alias_sql(sql, self.alias, ctx)
+        return sql
+
+
+def search_result(article, category: dict, hit: SearchHit, fields: Optional[list[str]] = None) -> dict:
+    """
+    Search result entry for an article (model instance or attribute-style row),
+    with the SearchResultItem fields or just ``fields`` of them
+    """
+    values = {"category": category, "rank": hit.rank, "snippet": hit.snippet}
+    return {
+        name: values[name] if name in values else getattr(article, name)
+        for name in fields or field_names(SearchResultItem)
+    }
+
+
+class SearchBackend:
+    """
+    Interface of the search backends behind /api/search.
+
+    Backends that keep their own index override the ``build``/``index_article``/
+    ``remove_article`` hooks and their batch variants, which are called at startup and on admin writes,
+    and ``start``/``stop`` to refresh it in the background.
+    """
+
+    async def build(self):
+        pass
+
+    def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def index_article(self, article: Article):
+        pass
+
+    async def index_articles(self, articles: list[Article]):
+        """index_article for a batch, backends override it when batching is cheaper"""
+        for article in articles:
+            await self.index_article(article)
+
+    async def remove_article(self, article_id: int):
+        pass
+
+    async def remove_articles(self, article_ids: list[int]):
+        """remove_article for a batch, backends override it when batching is cheaper"""
+        for article_id in article_ids:
+            await self.remove_article(article_id)
+
+    async def search(
+        self,
+        q: str,
+        categories: Optional[list[str]],
+        limit: int,
+        offset: int = 0,
+        after: Optional[list] = None
+    ) -> list[SearchHit]:
+        """Ranked page of hits, ``after`` is a decoded (rank, id) cursor"""
+        raise NotImplementedError
+
+    async def count(self, q: str, categories: Optional[list[str]]) -> int:
+        raise NotImplementedError
+
+    async def estimate(self, q: str, categories: Optional[list[str]]) -> int:
+        return await self.count(q, categories)
+
+    async def results(self, hits: list[SearchHit], fields: Optional[list[str]] = None) -> list[dict]:
+        """Response entries for a page of hits, in hit order, optionally limited to ``fields``"""
+        articles = await Article.filter(id__in=[hit.id for hit in hits]).only(*columns(SearchResultItem, fields))
+        articles_by_id = {article.id: article for article in articles}
+        categories = await category_registry.summaries(article.category_id for article in articles)
+        return [
+            search_result(articles_by_id[hit.id], categories[articles_by_id[hit.id].category_id], hit, fields)
+            for hit in hits if hit.id in articles_by_id
+        ]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Full-text search over published articles.
+
+    Matches on the weighted ``search_vector`` column (GIN indexed), ranks with
+    ``ts_rank`` and builds highlighted snippets with ``ts_headline`` for the
+    returned page only.
+    """
+
+    async def _where(self, q: str, categories: Optional[list[str]], params: list) -> str:
+        params.append(q)
+        clauses = ["a.status = 'published'", "a.search_vector @@ query"]
+        if categories:
+            params.append(await category_registry.ids_for_slugs(categories))
+            clauses.append(f"a.category_id = ANY(${len(params)}::int[])")
+        return " AND ".join(clauses)
+
+    async def search(
+        self,
+        q: str,
+        categories: Optional[list[str]],
+        limit: int,
+        offset: int = 0,
+        after: Optional[list] = None
+    ) -> list[SearchHit]:
+        params = []
+        where = await self._where(q, categories, params)
+
+        if after:
+            params.extend(after)
+            rank_param, id_param = len(params) - 1, len(params)
+            where += (
+                f" AND (ts_rank(a.search_vector, query) < ${rank_param}"
+                f" OR (ts_rank(a.search_vector, query) = ${rank_param} AND a.id < ${id_param}))"
+            )
+
+        params.extend([limit, offset])
+        sql = f"""
+            SELECT page.id, page.rank,
+                ts_headline('{SEARCH_CONFIG}', coalesce(page.summary, '') || ' ' || page.content, query, '{HEADLINE_OPTIONS}') AS snippet
+            FROM (
+                SELECT a.id, a.summary, a.content, ts_rank(a.search_vector, query) AS rank
+                FROM articles a, websearch_to_tsquery('{SEARCH_CONFIG}', $1) AS query
+                WHERE {where}
+                ORDER BY rank DESC, a.id DESC
+                LIMIT ${len(params) - 1} OFFSET ${len(params)}
+            ) AS page, websearch_to_tsquery('{SEARCH_CONFIG}', $1) AS query
+            ORDER BY page.rank DESC, page.id DESC
+        """
+        rows = await connections.get("default").execute_query_dict(sql, params)
+        return [SearchHit(row["id"], row["rank"], row["snippet"]) for row in rows]
+
+    async def _count_sql(self, q: str, categories: Optional[list[str]], select: str) -> tuple[str, list]:
+        params = []
+        where = await self._where(q, categories, params)
+        return (
+            f"SELECT {select} FROM articles a, websearch_to_tsquery('{SEARCH_CONFIG}', $1) AS query WHERE {where}",
+            params
+        )
+
+    async def count(self, q: str, categories: Optional[list[str]]) -> int:
+        """Exact number of matching published articles"""
+        sql, params = await self._count_sql(q, categories, "count(*) AS total")
+        rows = await connections.get("default").execute_query_dict(sql, params)
+        return rows[0]["total"]
+
+    async def estimate(self, q: str, categories: Optional[list[str]]) -> int:
+        """Planner estimate of the number of matching published articles"""
+        sql, params = await self._count_sql(q, categories, "1")
+        return await estimate_sql_count(sql, params)
+
+
+def create_search_backend() -> SearchBackend:
+    """Backend selected by settings.SEARCH_BACKEND"""
+    if settings.SEARCH_BACKEND == "memory":
+        from services.bm25 import InMemorySearchBackend
+        return InMemorySearchBackend(refresh_interval=settings.SEARCH_INDEX_REFRESH_SECONDS)
+    return PostgresSearchBackend()
+
+
+search_backend = create_search_backend()
@@ -0,0 +1,55 @@
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+def _default(value: Any):
+    """Types orjson does not encode natively"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """JSON bytes for dicts, lists, datetimes and pydantic models, with UTC datetimes ending in Z like pydantic's"""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response encoded with orjson.
+
+    Used as the app's default response class. List endpoints also return it
+    directly with plain dicts built by ``serialize_row``, which skips the
+    per-row model construction and the response_model re-validation.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def field_names(schema: type[BaseModel]) -> tuple[str, ...]:
+    """Field names of a response schema (``model_fields`` is rebuilt on every access)"""
+    return tuple(schema.model_fields)
+
+
+def serialize_row(schema: type[BaseModel], row, categories: dict[int, dict], fields: Optional[list[str]] = None) -> dict:
+    """
+    Response item for a row (ORM instance or ``.values()`` dict) loaded with
+    ``projection.columns(schema, fields)``: a dict of the schema's fields, or
+    only ``fields`` of them. ``category`` is filled from ``categories``.
+    """
+    get = row.__getitem__ if isinstance(row, dict) else row.__getattribute__
+    return {
+        name: categories[get("category_id")] if name == "category" else get(name)
+        for name in fields or field_names(schema)
+    }
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from typing import Optional
+
+from tortoise import connections, timezone
+from tortoise.expressions import F
+
+from db.models import SiteStats
+from config import settings
+from services.background import BackgroundFlusher
+
+
+REFRESH_STATS_SQL = """
+UPDATE site_stats SET
+    total_articles = (SELECT count(*) FROM articles WHERE status = 'published'),
+    total_users = (SELECT count(*) FROM users WHERE is_active),
+    total_views = (SELECT coalesce(sum(views), 0) FROM article_view_daily) + (
+        SELECT count(*) FROM article_views
+        WHERE viewed_at >= (SELECT coalesce((max(day) + 1)::timestamp AT TIME ZONE 'UTC', '-infinity') FROM article_view_daily)
+    ),
+    last_updated = now()
+"""
+
+
+def published_delta(before: Optional[tuple[str, int]], after: Optional[tuple[str, int]]) -> int:
+    """Change in published articles for an article write, states as in category_counts"""
+    return (after is not None and after[0] == "published") - (before is not None and before[0] == "published")
+
+
+class SiteStatsMaterializer(BackgroundFlusher):
+    """
+    Keeps the single SiteStats row current without scanning on reads.
+
+    Writers apply deltas as they happen: view ingestion adds the views it
+    flushes, article writes adjust total_articles and signups total_users.
+    Every ``flush_interval`` seconds the counters are recomputed from the
+    source tables to correct drift (e.g. users created outside this API);
+    ``last_updated`` is the time of that full refresh.
+
+    Readers get the row from a per-process cache that is at most
+    ``max_staleness`` seconds old.
+    """
+
+    flush_on_stop = False
+
+    def __init__(self, refresh_interval: float, max_staleness: float):
+        super().__init__(refresh_interval)
+        self.max_staleness = max_staleness
+        self._cached: Optional[SiteStats] = None
+        self._cached_at = timezone.now()
+
+    async def flush(self):
+        """Full refresh, unless another worker did one within the interval"""
+        await self.refresh(max_age=self.flush_interval)
+
+    async def refresh(self, max_age: Optional[float] = None):
+        """Recompute every counter, or only if the last full refresh is older than ``max_age`` seconds"""
+        stats = await SiteStats.first()
+        if stats is None:
+            await SiteStats.create()
+        elif max_age is not None and timezone.now() - stats.last_updated < timedelta(seconds=max_age):
+            return
+        await connections.get("default").execute_query(REFRESH_STATS_SQL)
+        self._cached = None
+
+    async def add(self, **deltas: int):
+        """Apply counter deltas, e.g. ``add(total_users=1)``"""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            await SiteStats.all().update(**{field: F(field) + delta for field, delta in deltas.items()})
+
+    async def get(self) -> SiteStats:
+        """The stats row, read from the database at most every ``max_staleness`` seconds"""
+        now = timezone.now()
+        if self._cached is None or now - self._cached_at > timedelta(seconds=self.max_staleness):
+            self._cached = await SiteStats.first() or SiteStats()
+            self._cached_at = now
+        return self._cached
+
+
+site_stats = SiteStatsMaterializer(
+    refresh_interval=settings.STATS_REFRESH_SECONDS,
+    max_staleness=settings.STATS_MAX_STALENESS_SECONDS,
+)
@@ -0,0 +1,235 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from typing import NamedTuple, Optional
+
+from db.models import Article, Category
+from config import settings
+from services.background import BackgroundFlusher
+
+
+WORD_RE = re.compile(r"\w+")
+
+# Titles are also indexed from each of their first words, so "summit" finds
+# "Climate summit opens"
+MAX_TITLE_KEY_WORDS = 8
+
+# Most suggestions a lookup can return, cached rankings hold this many
+MAX_SUGGESTIONS = 20
+
+# Above this many key changes at once, the sorted key list is rebuilt
+# instead of updated one key at a time
+BULK_KEY_CHANGES = 64
+
+
+class Suggestion(NamedTuple):
+    text: str
+    type: str  # "article", "category" or "author"
+    id: Optional[int]
+    slug: Optional[str]
+    views_count: int
+
+
+def normalize(text: str) -> str:
+    return " ".join(WORD_RE.findall(text.lower()))
+
+
+def title_keys(title: str) -> list[str]:
+    words = normalize(title).split()
+    return list(dict.fromkeys(" ".join(words[i:]) for i in range(min(len(words), MAX_TITLE_KEY_WORDS))))
+
+
+class SuggestIndex(BackgroundFlusher):
+    """
+    Prefix index for search-as-you-type over article titles, category names
+    and authors.
+
+    Keys live in one sorted list, so the keys matching a prefix are one
+    range found by binary search. Ranges of up to ``max_scan`` keys are
+    ranked by views_count on each lookup; the ranking of a larger range (a
+    short prefix) is computed once and cached until a write changes a key
+    under that prefix. Article writes update the index in place; a periodic
+    rebuild every ``flush_interval`` seconds picks up view counts and other
+    workers' writes.
+    """
+
+    flush_on_stop = False
+
+    def __init__(self, max_scan: int, refresh_interval: float):
+        super().__init__(refresh_interval)
+        self.max_scan = max_scan
+        self._reset()
+
+    def _reset(self):
+        self._keys: list[tuple[str, tuple]] = []
+        self._suggestions: dict[tuple, Suggestion] = {}
+        # Top MAX_SUGGESTIONS suggestion keys of the prefixes matching more than max_scan keys
+        self._top: dict[str, list[tuple]] = {}
+        # Key changes not yet applied to _keys, and keys whose prefixes' rankings are stale
+        self._added: set[tuple[str, tuple]] = set()
+        self._dropped: set[tuple[str, tuple]] = set()
+        self._touched: set[str] = set()
+        # Per-article contribution to the author and category weights
+        self._articles: dict[int, tuple[str, int, int]] = {}
+        self._author_totals: dict[str, list[int]] = {}
+        self._category_views: dict[int, int] = {}
+
+    async def flush(self):
+        """Rebuild from the database"""
+        await self.build()
+
+    async def build(self):
+        categories = await Category.all()
+        rows = await Article.filter(status="published").values(
+            "id", "title", "slug", "author", "views_count", "category_id"
+        )
+
+        self._reset()
+        for category in categories:
+            self._category_views[category.id] = 0
+            self._put(("category", category.id), Suggestion(category.name, "category", category.id, category.slug, 0))
+        for row in rows:
+            self._add_article(row["id"], row["title"], row["slug"], row["author"], row["views_count"], row["category_id"])
+        self._apply_key_changes()
+
+    def index_article(self, article: Article):
+        """Add, replace or drop an article after an admin write"""
+        self.index_articles([article])
+
+    def index_articles(self, articles: list[Article]):
+        """index_article for a batch, the key list is updated once"""
+        for article in articles:
+            self._remove_article(article.id)
+            if article.status == "published":
+                self._add_article(
+                    article.id, article.title, article.slug, article.author, article.views_count, article.category_id
+                )
+        self._apply_key_changes()
+
+    def remove_article(self, article_id: int):
+        self.remove_articles([article_id])
+
+    def remove_articles(self, article_ids: list[int]):
+        """remove_article for a batch, the key list is updated once"""
+        for article_id in article_ids:
+            self._remove_article(article_id)
+        self._apply_key_changes()
+
+    def suggest(self, q: str, limit: int) -> list[Suggestion]:
+        """Top ``limit`` suggestions whose key starts with ``q``, by views_count"""
+        prefix = normalize(q)
+        if not prefix:
+            return []
+
+        # Keep the trailing space of a finished word, so "art " does not match "artist"
+        if q.endswith(" "):
+            prefix += " "
+
+        start = bisect_left(self._keys, (prefix,))
+        end = bisect_left(self._keys, (prefix + "\U0010ffff",), start)
+        if end - start <= self.max_scan:
+            top = self._rank(start, end, limit)
+        else:
+            top = self._top.get(prefix)
+            if top is None:
+                top = self._top[prefix] = self._rank(start, end, MAX_SUGGESTIONS)
+        return [self._suggestions[suggestion_key] for suggestion_key in top[:limit]]
+
+    def _rank(self, start: int, end: int, limit: int) -> list[tuple]:
+        """Keys of the top ``limit`` suggestions in a range of the key list, by views_count"""
+        return heapq.nlargest(
+            limit,
+            {suggestion_key for _, suggestion_key in self._keys[start:end]},
+            key=lambda suggestion_key: self._suggestions[suggestion_key].views_count
+        )
+
+    def _put(self, suggestion_key: tuple, suggestion: Suggestion, keys: list[str] = None):
+        """Insert or re-weight a suggestion, ``keys`` are only needed on insert"""
+        keys = keys or [normalize(suggestion.text)]
+        if suggestion_key not in self._suggestions:
+            for key in keys:
+                entry = (key, suggestion_key)
+                if entry in self._dropped:
+                    self._dropped.discard(entry)
+                else:
+                    self._added.add(entry)
+        self._touched.update(keys)
+        self._suggestions[suggestion_key] = suggestion
+
+    def _drop(self, suggestion_key: tuple, keys: list[str]):
+        for key in keys:
+            entry = (key, suggestion_key)
+            if entry in self._added:
+                self._added.discard(entry)
+            else:
+                self._dropped.add(entry)
+        self._touched.update(keys)
+        del self._suggestions[suggestion_key]
+
+    def _apply_key_changes(self):
+        """Apply the pending key changes to the sorted list and drop the rankings they affect"""
+        if len(self._added) + len(self._dropped) > BULK_KEY_CHANGES:
+            if self._dropped:
+                self._keys = [entry for entry in self._keys if entry not in self._dropped]
+            self._keys.extend(self._added)
+            self._keys.sort()
+        else:
+            for entry in self._dropped:
+                position = bisect_left(self._keys, entry)
+                if position < len(self._keys) and self._keys[position] == entry:
+                    del self._keys[position]
+            for entry in self._added:
+                insort(self._keys, entry)
+        self._added.clear()
+        self._dropped.clear()
+
+        if len(self._touched) > BULK_KEY_CHANGES:
+            self._top.clear()
+        elif self._top:
+            for key in self._touched:
+                for length in range(1, len(key) + 1):
+                    self._top.pop(key[:length], None)
+        self._touched.clear()
+
+    def _add_article(self, article_id: int, title: str, slug: str, author: str, views_count: int, category_id: int):
+        self._put(("article", article_id), Suggestion(title, "article", article_id, slug, views_count), title_keys(title))
+        self._articles[article_id] = (author, views_count, category_id)
+
+        totals = self._author_totals.setdefault(author, [0, 0])
+        totals[0] += 1
+        totals[1] += views_count
+        self._put(("author", author), Suggestion(author, "author", None, None, totals[1]))
+
+        self._adjust_category(category_id, views_count)
+
+    def _remove_article(self, article_id: int):
+        if article_id not in self._articles:
+            return
+
+        title = self._suggestions[("article", article_id)].text
+        self._drop(("article", article_id), title_keys(title))
+        author, views_count, category_id = self._articles.pop(article_id)
+
+        totals = self._author_totals[author]
+        totals[0] -= 1
+        totals[1] -= views_count
+        if totals[0] == 0:
+            del self._author_totals[author]
+            self._drop(("author", author), [normalize(author)])
+        else:
+            self._put(("author", author), Suggestion(author, "author", None, None, totals[1]))
+
+        self._adjust_category(category_id, -views_count)
+
+    def _adjust_category(self, category_id: int, views_delta: int):
+        suggestion = self._suggestions.get(("category", category_id))
+        if suggestion is None:
+            return
+        self._category_views[category_id] += views_delta
+        self._put(("category", category_id), suggestion._replace(views_count=self._category_views[category_id]))
+
+
+suggest_index = SuggestIndex(
+    max_scan=settings.SUGGEST_MAX_SCAN,
+    refresh_interval=settings.SUGGEST_REFRESH_SECONDS,
+)
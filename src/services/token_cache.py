@@ -0,0 +1,54 @@
+import time
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Optional
+
+from config import settings
+
+
+class VerifiedTokenCache:
+    """
+    LRU cache of verified JWT payloads, keyed by a digest of the token.
+
+    A hit skips the signature check and JSON parsing of ``jwt.decode``. Only
+    tokens that passed verification are stored, and an entry is served only
+    until the token's ``exp``, so a cached token expires exactly like an
+    uncached one. Tokens without ``exp`` are not cached.
+    """
+
+    def __init__(self, max_entries: int, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: OrderedDict[bytes, dict] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """The verified payload of a token, None if it is not cached or has expired"""
+        if not self.enabled:
+            return None
+        key = self._key(token)
+        payload = self._entries.get(key)
+        if payload is None:
+            return None
+        if payload["exp"] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def put(self, token: str, payload: dict):
+        """Store the payload of a token that ``jwt.decode`` verified"""
+        if not self.enabled or not isinstance(payload.get("exp"), (int, float)):
+            return
+        self._entries[self._key(token)] = payload
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+verified_tokens = VerifiedTokenCache(
+    max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    enabled=settings.AUTH_TOKEN_CACHE_ENABLED,
+)
@@ -0,0 +1,84 @@
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Optional
+
+from tortoise import connections
+
+from config import settings
+from services.background import BackgroundFlusher
+
+
+REVOKE_SQL = """
+INSERT INTO revoked_tokens (jti, expires_at, revoked_at) VALUES ($1, $2, now())
+ON CONFLICT (jti) DO NOTHING
+"""
+
+# $1 unexpired after, $2 revoked since (None for all)
+REVOKED_SQL = """
+SELECT jti, extract(epoch FROM expires_at)::float8 AS expires_at
+FROM revoked_tokens
+WHERE expires_at > $1 AND ($2::timestamptz IS NULL OR revoked_at >= $2)
+"""
+
+PRUNE_SQL = "DELETE FROM revoked_tokens WHERE expires_at <= now()"
+
+# Rows are read again for this long after their revoked_at, so a revocation
+# committed late or stamped by a skewed clock is not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class TokenRevocations(BackgroundFlusher):
+    """
+    Revoked access tokens, checked in memory.
+
+    Logout stores the token's ``jti`` claim and expiry in revoked_tokens and
+    in this process's map of unexpired revoked jtis, so ``is_revoked`` is a
+    dict lookup. Every ``flush_interval`` seconds each worker reads the
+    revocations made since its last sync, which bounds how long another
+    worker accepts a revoked token, and drops expired entries from memory and
+    the table; an expired token is rejected by its exp anyway.
+    """
+
+    flush_on_stop = False
+
+    def __init__(self, sync_interval: float):
+        super().__init__(sync_interval)
+        self._revoked: dict[str, float] = {}
+        self._synced_at: Optional[datetime] = None
+
+    async def flush(self):
+        await self.sync()
+        self.prune_memory()
+        await connections.get("default").execute_query(PRUNE_SQL)
+
+    async def load(self):
+        """Read every unexpired revocation, at startup"""
+        self._synced_at = None
+        self._revoked.clear()
+        await self.sync()
+
+    async def sync(self):
+        """Read the revocations made since the last sync"""
+        started = datetime.now(dt_timezone.utc)
+        since = self._synced_at - SYNC_OVERLAP if self._synced_at else None
+        rows = await connections.get("default").execute_query_dict(REVOKED_SQL, [started, since])
+        for row in rows:
+            self._revoked[row["jti"]] = row["expires_at"]
+        self._synced_at = started
+
+    def prune_memory(self):
+        now = time.time()
+        self._revoked = {jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > now}
+
+    async def revoke(self, jti: str, expires_at: float):
+        """Revoke a token by its jti and exp claims"""
+        self._revoked[jti] = expires_at
+        await connections.get("default").execute_query(
+            REVOKE_SQL, [jti, datetime.fromtimestamp(expires_at, dt_timezone.utc)]
+        )
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._revoked
+
+
+token_revocations = TokenRevocations(sync_interval=settings.AUTH_REVOCATION_SYNC_SECONDS)
@@ -0,0 +1,179 @@
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from tortoise import connections
+from tortoise.transactions import in_transaction
+
+from db.models import TrendingState
+from config import settings
+from services.background import BackgroundFlusher
+
+
+# Serializes recomputes across worker processes (pg_try_advisory_xact_lock key)
+TRENDING_LOCK_KEY = 0x7472656E64
+
+# Rebase scores onto a new epoch before exp() of the elapsed time gets large
+MAX_EPOCH_AGE_HALF_LIVES = 32
+
+NOW_SQL = "SELECT extract(epoch FROM now())::float8 AS now"
+
+# Taken once, when the scores are first computed from the table: waits for
+# view flushes in progress and holds off new ones until the state row exists
+LOCK_VIEWS_SQL = "LOCK TABLE article_views IN SHARE MODE"
+
+REBASE_SQL = "UPDATE trending_scores SET score = score * $1"
+
+# $1 decay rate, $2 epoch, $3 window start
+ADD_VIEWS_SQL = """
+INSERT INTO trending_scores (article_id, score)
+SELECT article_id, sum(exp($1::float8 * (extract(epoch FROM viewed_at) - $2::float8)))
+FROM article_views
+WHERE viewed_at >= $3
+GROUP BY article_id
+ON CONFLICT (article_id) DO UPDATE SET score = trending_scores.score + excluded.score
+"""
+
+# $1 article ids, $2 viewed_at, $3 decay rate. Runs in the view ingestion
+# transaction; the share lock on the state row keeps the epoch fixed until
+# commit (a recompute holds it for update while it rebases). Ordered by
+# article so concurrent flushes lock score rows in the same order.
+ADD_FLUSHED_VIEWS_SQL = """
+INSERT INTO trending_scores (article_id, score)
+SELECT v.article_id, sum(exp($3::float8 * (extract(epoch FROM v.viewed_at) - s.epoch)))
+FROM unnest($1::int[], $2::timestamptz[]) AS v(article_id, viewed_at)
+CROSS JOIN (SELECT epoch FROM trending_state FOR SHARE) AS s
+WHERE EXISTS (SELECT 1 FROM articles a WHERE a.id = v.article_id)
+GROUP BY v.article_id
+ORDER BY v.article_id
+ON CONFLICT (article_id) DO UPDATE SET score = trending_scores.score + excluded.score
+"""
+
+# $1 decay rate, $2 epoch, $3 previous window start, $4 window start
+EXPIRE_VIEWS_SQL = """
+UPDATE trending_scores AS t
+SET score = t.score - e.score
+FROM (
+    SELECT article_id, sum(exp($1::float8 * (extract(epoch FROM viewed_at) - $2::float8))) AS score
+    FROM article_views
+    WHERE viewed_at >= $3 AND viewed_at < $4
+    GROUP BY article_id
+) AS e
+WHERE t.article_id = e.article_id
+"""
+
+PRUNE_SQL = "DELETE FROM trending_scores WHERE score < $1"
+
+RANKING_SQL = """
+SELECT t.article_id
+FROM trending_scores t
+JOIN articles a ON a.id = t.article_id
+WHERE a.status = 'published'
+ORDER BY t.score DESC, t.article_id DESC
+LIMIT $1
+"""
+
+CLEAR_TRENDING_SQL = "UPDATE articles SET is_trending = false WHERE is_trending AND NOT (id = ANY($1::int[]))"
+SET_TRENDING_SQL = "UPDATE articles SET is_trending = true WHERE id = ANY($1::int[]) AND NOT is_trending"
+
+
+class TrendingEngine(BackgroundFlusher):
+    """
+    Ranks published articles by recent views with exponential time decay.
+
+    An article's score is the sum over its views in the last ``window``
+    of ``exp(-decay * age)``. Scores are stored with forward decay, as
+    ``exp(decay * (viewed_at - epoch))``: a fixed epoch makes the stored
+    scores of all articles decay by the same factor, so the ranking only
+    changes when views are added or expire and nothing has to be rewritten
+    as time passes.
+
+    New views are added to the scores by the view ingestion flush, in the
+    transaction that inserts them, so each view is scored exactly once
+    whatever order concurrent flushes commit in. Each recompute reads only
+    the article_views rows that left the window (a viewed_at range), never
+    the whole table, except the first one, which scores the views already
+    in the window. It then flags the top ``trending_limit`` articles as
+    is_trending, in a separate transaction. One worker process
+    recomputes at a time; every process reloads the ranking that
+    /api/trending is served from.
+    """
+
+    flush_on_stop = False
+
+    def __init__(self, refresh_interval: float, window_days: int, half_life_hours: float, ranking_size: int, trending_limit: int):
+        super().__init__(refresh_interval)
+        self.window = timedelta(days=window_days)
+        self.decay = math.log(2) / (half_life_hours * 3600)
+        self.ranking_size = ranking_size
+        self.trending_limit = trending_limit
+        self._ranking: list[int] = []
+
+    async def flush(self):
+        await self.recompute()
+        await self.load_ranking()
+
+    async def recompute(self) -> bool:
+        """Apply new and expired views to the scores, False if another worker holds the lock"""
+        async with in_transaction() as conn:
+            locked = await conn.execute_query_dict("SELECT pg_try_advisory_xact_lock($1) AS locked", [TRENDING_LOCK_KEY])
+            if not locked[0]["locked"]:
+                return False
+
+            now = (await conn.execute_query_dict(NOW_SQL))[0]["now"]
+            window_start = datetime.fromtimestamp(now, dt_timezone.utc) - self.window
+
+            state = await TrendingState.first().select_for_update().using_db(conn)
+            if state is None:
+                await conn.execute_query(LOCK_VIEWS_SQL)
+                state = await TrendingState.create(epoch=now, window_start=window_start, using_db=conn)
+                await conn.execute_query(ADD_VIEWS_SQL, [self.decay, state.epoch, window_start])
+
+            if self.decay * (now - state.epoch) > MAX_EPOCH_AGE_HALF_LIVES * math.log(2):
+                await conn.execute_query(REBASE_SQL, [math.exp(-self.decay * (now - state.epoch))])
+                state.epoch = now
+
+            await conn.execute_query(EXPIRE_VIEWS_SQL, [self.decay, state.epoch, state.window_start, window_start])
+            # Half of the smallest score a single view still in the window can
+            # contribute, anything below is floating point residue of expired views
+            await conn.execute_query(PRUNE_SQL, [
+                0.5 * math.exp(self.decay * (window_start.timestamp() - state.epoch))
+            ])
+
+            state.window_start = window_start
+            await state.save(using_db=conn)
+
+        # Flagged in a second transaction, once the state row is released: a
+        # view flush locks articles rows before the state row, so updating
+        # articles while holding it could deadlock with one. If another worker
+        # has started a recompute meanwhile, it sets the flags itself.
+        async with in_transaction() as conn:
+            locked = await conn.execute_query_dict("SELECT pg_try_advisory_xact_lock($1) AS locked", [TRENDING_LOCK_KEY])
+            if locked[0]["locked"]:
+                top = await conn.execute_query_dict(RANKING_SQL, [self.trending_limit])
+                trending_ids = [row["article_id"] for row in top]
+                await conn.execute_query(CLEAR_TRENDING_SQL, [trending_ids])
+                await conn.execute_query(SET_TRENDING_SQL, [trending_ids])
+        return True
+
+    async def add_views(self, conn, views: list[tuple]):
+        """Score views (as queued by ViewIngestion) inside the transaction that inserts them"""
+        await conn.execute_query(ADD_FLUSHED_VIEWS_SQL, [
+            [view[0] for view in views], [view[3] for view in views], self.decay
+        ])
+
+    async def load_ranking(self):
+        rows = await connections.get("default").execute_query_dict(RANKING_SQL, [self.ranking_size])
+        self._ranking = [row["article_id"] for row in rows]
+
+    def top(self, limit: int) -> list[int]:
+        """Ids of the ``limit`` highest scoring published articles, best first"""
+        return self._ranking[:limit]
+
+
+trending_engine = TrendingEngine(
+    refresh_interval=settings.TRENDING_REFRESH_SECONDS,
+    window_days=settings.TRENDING_DAYS_THRESHOLD,
+    half_life_hours=settings.TRENDING_HALF_LIFE_HOURS,
+    ranking_size=settings.TRENDING_RANKING_SIZE,
+    trending_limit=settings.TRENDING_ARTICLES_LIMIT,
+)
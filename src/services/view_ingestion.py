@@ -0,0 +1,97 @@
+from collections import Counter
+from typing import Optional
+
+from loguru import logger
+from tortoise import timezone
+from tortoise.transactions import in_transaction
+
+from config import settings
+from services.background import BackgroundFlusher
+from services.unique_views import unique_views
+from services.trending import trending_engine
+
+
+# Also adds the inserted rows to the materialized SiteStats.total_views
+INSERT_VIEWS_SQL = """
+WITH inserted AS (
+    INSERT INTO article_views (article_id, ip_address, user_agent, viewed_at)
+    SELECT v.article_id, v.ip_address, v.user_agent, v.viewed_at
+    FROM unnest($1::int[], $2::varchar[], $3::text[], $4::timestamptz[])
+        AS v(article_id, ip_address, user_agent, viewed_at)
+    JOIN articles a ON a.id = v.article_id
+    RETURNING 1
+)
+UPDATE site_stats SET total_views = total_views + (SELECT count(*) FROM inserted)
+"""
+
+INCREMENT_VIEWS_SQL = """
+UPDATE articles AS a
+SET views_count = a.views_count + d.views
+FROM unnest($1::int[], $2::int[]) AS d(article_id, views)
+WHERE a.id = d.article_id
+"""
+
+
+class ViewIngestion(BackgroundFlusher):
+    """
+    Write-behind buffer for article views.
+
+    Views are queued in memory and written in one multi-row INSERT plus one
+    coalesced views_count UPDATE per flush. A flush happens when the buffer
+    reaches ``max_size`` events or every ``flush_interval`` seconds, so a crash
+    loses at most that many views.
+    """
+
+    def __init__(self, max_size: int, flush_interval: float):
+        super().__init__(flush_interval)
+        self.max_size = max_size
+        self._views: list[tuple] = []
+        self._pending: Counter = Counter()
+        self._flushing: Counter = Counter()
+
+    def record(self, article_id: int, ip_address: str, user_agent: Optional[str]):
+        """Queue a single view event"""
+        self._views.append((article_id, ip_address, user_agent, timezone.now()))
+        self._pending[article_id] += 1
+        if len(self._views) >= self.max_size:
+            self.request_flush()
+
+    def pending_views(self, article_id: int) -> int:
+        """Views recorded for an article that are not yet in views_count"""
+        return self._pending.get(article_id, 0) + self._flushing.get(article_id, 0)
+
+    async def flush(self) -> int:
+        """Write all buffered views to the database, returns the number written"""
+        async with self.flush_lock:
+            if not self._views:
+                return 0
+
+            views, self._views = self._views, []
+            # Counted in pending_views until the transaction commits
+            self._flushing, self._pending = self._pending, Counter()
+            counts = self._flushing
+
+            try:
+                async with in_transaction() as conn:
+                    await conn.execute_query(INSERT_VIEWS_SQL, [list(column) for column in zip(*views)])
+                    await conn.execute_query(INCREMENT_VIEWS_SQL, [list(counts.keys()), list(counts.values())])
+                    await unique_views.add(conn, views)
+                    await trending_engine.add_views(conn, views)
+            except Exception:
+                logger.exception("Failed to flush {} article views", len(views))
+                # Put the batch back so the next flush retries it, unless that
+                # would grow the buffer past its bound
+                if len(self._views) + len(views) <= self.max_size * 2:
+                    self._views = views + self._views
+                    self._pending.update(counts)
+                self._flushing = Counter()
+                return 0
+
+            self._flushing = Counter()
+            return len(views)
+
+
+view_ingestion = ViewIngestion(
+    max_size=settings.VIEW_BUFFER_MAX_SIZE,
+    flush_interval=settings.VIEW_FLUSH_INTERVAL_SECONDS,
+)
@@ -0,0 +1,184 @@
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+from typing import Optional
+
+from tortoise.transactions import in_transaction
+
+from config import settings
+from db.schema import declared_indexes
+from services.background import BackgroundFlusher
+
+
+# Serializes partition maintenance across worker processes (advisory lock key)
+VIEW_ROLLUP_LOCK_KEY = 0x7669657773
+
+PARTITION_PREFIX = "article_views_p"
+
+IS_PARTITIONED_SQL = "SELECT relkind = 'p' AS partitioned FROM pg_class WHERE oid = 'article_views'::regclass"
+
+PARTITIONS_SQL = """
+SELECT c.relname AS name
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'article_views'::regclass
+"""
+
+# Same columns as the table generate_schemas creates for ArticleView; the
+# primary key of a partitioned table has to include the partition key
+CREATE_PARTITIONED_SQL = """
+CREATE TABLE article_views_partitioned (
+    id INT NOT NULL DEFAULT nextval('article_views_id_seq'),
+    ip_address VARCHAR(45) NOT NULL,
+    user_agent TEXT,
+    viewed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    article_id INT NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    PRIMARY KEY (id, viewed_at)
+) PARTITION BY RANGE (viewed_at)
+"""
+
+COPY_VIEWS_SQL = """
+INSERT INTO article_views_partitioned (id, ip_address, user_agent, viewed_at, article_id)
+SELECT id, ip_address, user_agent, viewed_at, article_id FROM article_views
+WHERE viewed_at >= $1
+"""
+
+SWAP_TABLES_SQL = """
+ALTER SEQUENCE article_views_id_seq OWNED BY article_views_partitioned.id;
+DROP TABLE article_views;
+ALTER TABLE article_views_partitioned RENAME TO article_views;
+ALTER TABLE article_views RENAME CONSTRAINT article_views_partitioned_pkey TO article_views_pkey;
+ALTER TABLE article_views RENAME CONSTRAINT article_views_partitioned_article_id_fkey TO article_views_article_id_fkey;
+"""
+
+OLDEST_VIEW_SQL = "SELECT min(viewed_at) AS oldest FROM article_views"
+
+ROLLED_UP_THROUGH_SQL = "SELECT max(day) AS day FROM article_view_daily"
+
+# Whole UTC days in [$1, $2); recomputing a day replaces its rollup rows
+ROLLUP_SQL = """
+INSERT INTO article_view_daily (article_id, day, views, unique_ips)
+SELECT article_id, (viewed_at AT TIME ZONE 'UTC')::date, count(*), count(DISTINCT ip_address)
+FROM article_views
+WHERE viewed_at >= $1 AND viewed_at < $2
+GROUP BY 1, 2
+ON CONFLICT (article_id, day) DO UPDATE SET views = excluded.views, unique_ips = excluded.unique_ips
+"""
+
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, dt_time.min, dt_timezone.utc)
+
+
+def partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def create_partition_sql(day: date, parent: str = "article_views") -> str:
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(day)}" PARTITION OF {parent} '
+        f"FOR VALUES FROM ('{day_start(day).isoformat()}') TO ('{day_start(day + timedelta(days=1)).isoformat()}')"
+    )
+
+
+class ViewRollup(BackgroundFlusher):
+    """
+    Daily partitions, rollups and retention for article_views.
+
+    article_views is range-partitioned by UTC day on viewed_at, with
+    partitions created ``ahead_days`` in advance. Every ``flush_interval``
+    seconds the days that have closed are rolled up into article_view_daily
+    (views and distinct IPs per article and day), and raw partitions older
+    than ``retention_days`` are dropped, which costs no row deletes. The
+    last rolled up day is recomputed on each run to pick up views that were
+    still buffered when it closed.
+
+    Raw views are kept at least as long as the trending window, which expires
+    views from the scores by reading them back.
+    """
+
+    flush_on_stop = False
+
+    def __init__(self, interval: float, retention_days: int, ahead_days: int):
+        super().__init__(interval)
+        self.retention_days = max(retention_days, settings.TRENDING_DAYS_THRESHOLD + 2)
+        self.ahead_days = ahead_days
+
+    async def flush(self):
+        await self.maintain()
+
+    async def setup(self):
+        """
+        Partition article_views if generate_schemas created it as a plain table
+        (on a fresh or pre-partitioning database) and create upcoming partitions.
+
+        Existing views are rolled up, and only the ones inside the retention
+        period are copied into the partitions.
+        """
+        today = datetime.now(dt_timezone.utc).date()
+        async with in_transaction() as conn:
+            await conn.execute_query("SELECT pg_advisory_xact_lock($1)", [VIEW_ROLLUP_LOCK_KEY])
+
+            rows = await conn.execute_query_dict(IS_PARTITIONED_SQL)
+            if not rows[0]["partitioned"]:
+                oldest = (await conn.execute_query_dict(OLDEST_VIEW_SQL))[0]["oldest"]
+                if oldest is not None:
+                    await conn.execute_query(ROLLUP_SQL, [oldest, day_start(today)])
+
+                # Partitions for the whole retention period, so backfilled views have one too
+                cutoff = today - timedelta(days=self.retention_days)
+                await conn.execute_script(CREATE_PARTITIONED_SQL)
+                for offset in range(self.retention_days + self.ahead_days + 1):
+                    await conn.execute_script(create_partition_sql(cutoff + timedelta(days=offset), "article_views_partitioned"))
+                await conn.execute_query(COPY_VIEWS_SQL, [day_start(cutoff)])
+                await conn.execute_script(SWAP_TABLES_SQL)
+
+                for statement in declared_indexes().values():
+                    if 'ON "article_views"' in statement:
+                        await conn.execute_script(statement)
+
+            await self._create_partitions(conn, today)
+
+    async def maintain(self) -> bool:
+        """Roll up closed days, create upcoming partitions and drop expired ones, False if another worker holds the lock"""
+        today = datetime.now(dt_timezone.utc).date()
+        async with in_transaction() as conn:
+            locked = await conn.execute_query_dict("SELECT pg_try_advisory_xact_lock($1) AS locked", [VIEW_ROLLUP_LOCK_KEY])
+            if not locked[0]["locked"]:
+                return False
+
+            # Rollup first, the DDL below locks the table until commit
+            partitions = await self._partition_days(conn)
+            rolled_up = (await conn.execute_query_dict(ROLLED_UP_THROUGH_SQL))[0]["day"]
+            start = rolled_up or min(partitions, default=today)
+            if start < today:
+                await conn.execute_query(ROLLUP_SQL, [day_start(start), day_start(today)])
+
+            await self._create_partitions(conn, today, partitions)
+
+            cutoff = today - timedelta(days=self.retention_days)
+            for day in sorted(partitions):
+                if day < cutoff:
+                    await conn.execute_script(f'DROP TABLE "{partition_name(day)}"')
+            return True
+
+    async def _partition_days(self, conn) -> set[date]:
+        rows = await conn.execute_query_dict(PARTITIONS_SQL)
+        return {
+            datetime.strptime(row["name"][len(PARTITION_PREFIX):], "%Y%m%d").date()
+            for row in rows
+            if row["name"].startswith(PARTITION_PREFIX)
+        }
+
+    async def _create_partitions(self, conn, today: date, existing: Optional[set[date]] = None):
+        if existing is None:
+            existing = await self._partition_days(conn)
+        for offset in range(self.ahead_days + 1):
+            day = today + timedelta(days=offset)
+            if day not in existing:
+                await conn.execute_script(create_partition_sql(day))
+
+
+view_rollup = ViewRollup(
+    interval=settings.VIEW_ROLLUP_INTERVAL_SECONDS,
+    retention_days=settings.VIEW_RETENTION_DAYS,
+    ahead_days=settings.VIEW_PARTITIONS_AHEAD_DAYS,
+)
@@ -26,10 +26,13 @@ __all__ = [
     "ContentFlagResponse",
     "ContentFlagCreate",
     "ModerationAction",
+    "UniqueViewsResponse",
     
     # Common schemas
     "PaginatedResponse",
     "StatsResponse",
     "SearchResponse",
+    "SearchResultItem",
+    "SuggestResponse",
     "MessageResponse"
 ]
\ No newline at end of file
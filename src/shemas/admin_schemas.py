@@ -1,9 +1,16 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 from .article_schemas import ArticleListItem
 
 
+class ViewDedupStats(BaseModel):
+    hits: int  # repeat views dropped
+    misses: int  # views recorded
+    hit_rate: float
+    memory_bytes: int
+
+
 class AdminStatsResponse(BaseModel):
     total_articles: int
     published_articles: int
@@ -14,6 +21,60 @@ class AdminStatsResponse(BaseModel):
     total_views: int
     accuracy_rate: float
     recent_articles: List[ArticleListItem]
+    view_dedup: ViewDedupStats  # of the worker process that served the request
+
+
+class DailyUniqueViews(BaseModel):
+    day: date
+    unique_views: int
+
+
+class UniqueViewsResponse(BaseModel):
+    article_id: int
+    days: int
+    unique_views: int  # over the whole window, not the sum of the days
+    relative_error: float  # standard error of the estimates
+    daily: List[DailyUniqueViews]
+
+
+class BulkImportRowResult(BaseModel):
+    row: int  # 1-based, header and blank lines not counted
+    id: Optional[int] = None
+    slug: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkImportResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    results: List[BulkImportRowResult]
+
+
+class ArticleSetFilter(BaseModel):
+    status: Optional[str] = Field(None, pattern="^(draft|published|archived|flagged)$")
+    category_id: Optional[int] = None
+    is_featured: Optional[bool] = None
+    is_breaking_news: Optional[bool] = None
+    author: Optional[str] = Field(None, max_length=100)
+
+
+class ArticleBatchDelete(BaseModel):
+    # Articles to change: these ids, those matching the filter, or both
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    filter: Optional[ArticleSetFilter] = None
+
+
+class ArticleBatchUpdate(ArticleBatchDelete):
+    status: Optional[str] = Field(None, pattern="^(draft|published|archived|flagged)$")
+    is_featured: Optional[bool] = None
+    is_breaking_news: Optional[bool] = None
+    category_id: Optional[int] = None
+
+
+class ArticleBatchResponse(BaseModel):
+    affected: int
+    ids: List[int]
 
 
 class ContentFlagCreate(BaseModel):
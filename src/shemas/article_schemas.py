@@ -50,6 +50,7 @@ class ArticleResponse(BaseModel):
     meta_description: Optional[str]
     featured_image: Optional[str]
     views_count: int
+    unique_views: int = 0  # estimated distinct readers over UNIQUE_VIEWS_WINDOW_DAYS
     likes_count: int
     dislikes_count: int = 0
     shares_count: int
@@ -93,6 +94,7 @@ class ArticleListResponse(BaseModel):
     page: int
     limit: int
     pages: int
+    next_cursor: Optional[str] = None
 
 
 class TrendingArticleResponse(BaseModel):
@@ -1,7 +1,9 @@
 from pydantic import BaseModel, EmailStr
-from typing import Generic, List, TypeVar, Optional, Any
+from typing import Generic, List, TypeVar, Optional
 from datetime import datetime
 
+from .article_schemas import CategorySummary
+
 T = TypeVar('T')
 
 
@@ -24,12 +26,40 @@ class StatsResponse(BaseModel):
     accuracy_rate: float
     
 
+class SearchResultItem(BaseModel):
+    id: int
+    title: str
+    slug: str
+    summary: Optional[str]
+    author: str
+    featured_image: Optional[str]
+    views_count: int
+    published_at: Optional[datetime]
+    category: CategorySummary
+    rank: float
+    snippet: Optional[str]
+
+
 class SearchResponse(BaseModel):
     query: str
-    results: List[Any]
+    results: List[SearchResultItem]
     total: int
     page: int
     limit: int
+    next_cursor: Optional[str] = None
+
+
+class SuggestionItem(BaseModel):
+    text: str
+    type: str
+    id: Optional[int] = None
+    slug: Optional[str] = None
+    views_count: int
+
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: List[SuggestionItem]
 
 
 # Authentication Schemas